@@ -1,58 +1,26 @@
 """CS2 Battle Bot main module."""
 
-import discord
-import redis
-from cs2_battle_bot_api_client.api.guilds import guilds_create, guilds_retrieve
-from cs2_battle_bot_api_client.errors import UnexpectedStatus
-from cs2_battle_bot_api_client.models import CreateGuild, Guild
-from cs2_battle_bot_api_client.types import Response
-from redis import ConnectionError, TimeoutError
+from bot.startup import startup
 
-from bot.bot import bot
-from bot.cogs.match import MatchCog
-from bot.i18n import i18n
-from bot.logger import logger
-from bot.settings import api_client, settings
+# Cogs and API models are imported by the bot once the event loop runs.
+with startup.phase("imports"):
+    import discord
+
+    from bot.bot import bot
+    from bot.i18n import _
+    from bot.logger import logger
+    from bot.resilience import ApiUnavailableError
+    from bot.settings import settings
+
+startup.check_budget("imports", settings.STARTUP_IMPORT_BUDGET)
 
 
 @bot.event
 async def on_ready() -> None:
     """Print a message when the bot is ready."""
     logger.debug(f"We have logged in as {bot.user}")
-
-
-@bot.event
-async def on_guild_join(guild: discord.Guild) -> None:
-    """
-    Handle the bot joining a guild.
-
-    Args:
-    ----
-        guild (discord.Guild): The guild the bot joined.
-
-    Returns:
-    -------
-        None: This function does not return anything.
-
-    """
-    logger.info(f"Bot joined guild: {guild.name}")
-    try:
-        await guilds_retrieve.asyncio_detailed(
-            client=api_client, guild_id=str(guild.id)
-        )
-    except UnexpectedStatus:
-        new_guild_response: Response[Guild] = await guilds_create.asyncio_detailed(
-            client=api_client,
-            body=CreateGuild(
-                guild_id=str(guild.id),
-                name=guild.name,
-                owner_id=str(guild.owner_id),
-                owner_username=guild.owner.name,
-            ),
-        )
-        logger.info(
-            f"Guild {new_guild_response.content.decode(encoding='utf-8') } created."
-        )
+    startup.end("discord")
+    startup.report()
 
 
 @bot.event
@@ -72,25 +40,13 @@ async def on_application_command_error(
         None: This function does not return anything.
 
     """
+    if isinstance(getattr(error, "original", error), ApiUnavailableError):
+        logger.warning(repr(error))
+        await ctx.respond(_("error_api_unavailable"), ephemeral=True)
+        return
     logger.error(repr(error))
     logger.error(error)
     await ctx.respond("An error occurred while processing the command.")
 
 
-try:
-    _redis = redis.StrictRedis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        db=settings.REDIS_DB,
-        password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
-    )
-    response = _redis.ping()
-    pubsub = _redis.pubsub()
-    pubsub.psubscribe("event.*")
-    bot.add_cog(MatchCog(bot, pubsub))
-    logger.debug(f"Connected to Redis: {response}")
-except (ConnectionError, TimeoutError) as e:
-    logger.error(f"Redis connection error: {e}")
-    # Handle the error appropriately, e.g., retrying or logging
-i18n.localize_commands()
 bot.run(settings.DISCORD_BOT_TOKEN)
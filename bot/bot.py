@@ -1,5 +1,155 @@
 """Bot module."""
 
+import asyncio
+import importlib
+from typing import Any
+
 import discord
+from discord.ext import tasks
+
+from bot import http
+from bot.logger import logger
+from bot.settings import api_client, api_transport, redis_client, settings
+from bot.shards import ShardMetrics
+from bot.startup import retry, startup
+
+# Extensions imported in the background while dependencies are connected.
+EXTENSIONS = ["bot.cogs.match"]
+
+
+class Bot(discord.AutoShardedBot):
+    """Sharded bot that prepares its dependencies and cogs before connecting."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Bot constructor.
+
+        Args:
+        ----
+            *args: Arguments of ``discord.AutoShardedBot``.
+            **kwargs: Keyword arguments of ``discord.AutoShardedBot``.
+
+        Returns:
+        -------
+            None
+
+        """
+        super().__init__(*args, **kwargs)
+        self.shard_metrics = ShardMetrics(self)
+
+    async def start(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Prepare dependencies and cogs, then connect to Discord.
+
+        Args:
+        ----
+            *args: Arguments of ``discord.AutoShardedBot.start``.
+            **kwargs: Keyword arguments of ``discord.AutoShardedBot.start``.
+
+        Returns:
+        -------
+            None
+
+        """
+        await self.prepare()
+        self.report_shards.start()
+        startup.begin("discord")
+        await super().start(*args, **kwargs)
+
+    async def prepare(self) -> None:
+        """
+        Connect to Redis and the API while importing the extensions.
+
+        Redis is required by the match cog, so startup fails if it never
+        answers instead of running without the cog. The API is only warmed
+        up; its calls are retried later on their own.
+
+        Returns
+        -------
+            None
+
+        """
+        with startup.phase("dependencies"):
+            redis, api, *_ = await asyncio.gather(
+                retry(
+                    "Redis",
+                    redis_client.ping,
+                    settings.STARTUP_RETRIES,
+                    settings.STARTUP_RETRY_DELAY,
+                ),
+                retry(
+                    "API",
+                    lambda: http.warmup(
+                        api_client, settings.API_POOL_WARMUP_CONNECTIONS
+                    ),
+                    settings.STARTUP_RETRIES,
+                    settings.STARTUP_RETRY_DELAY,
+                ),
+                *(
+                    asyncio.to_thread(importlib.import_module, extension)
+                    for extension in EXTENSIONS
+                ),
+                return_exceptions=True,
+            )
+        if isinstance(api, Exception):
+            logger.warning(f"Could not warm up API connections: {api!r}")
+        if isinstance(redis, Exception):
+            logger.error(f"Redis unavailable, not starting: {redis!r}")
+            raise redis
+        with startup.phase("cogs"):
+            for extension in EXTENSIONS:
+                self.load_extension(extension)
+            # Imported here, the i18n module imports the bot.
+            from bot.i18n import i18n
+
+            i18n.localize_commands()
+
+    async def on_shard_connect(self, shard_id: int) -> None:
+        """Count a shard connecting to the gateway."""
+        self.shard_metrics.connects[shard_id] += 1
+
+    async def on_shard_disconnect(self, shard_id: int) -> None:
+        """Count a shard losing its gateway connection."""
+        self.shard_metrics.disconnects[shard_id] += 1
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        """Count a shard resuming its gateway session."""
+        self.shard_metrics.resumes[shard_id] += 1
+
+    @tasks.loop(seconds=settings.SHARD_METRICS_INTERVAL)
+    async def report_shards(self) -> None:
+        """Log latency, reconnects and event throughput of every shard."""
+        self.shard_metrics.sample()
+        for shard_id, stats in self.shard_metrics.stats().items():
+            logger.info(f"Shard {shard_id}: {stats}")
+
+    @report_shards.before_loop
+    async def before_report_shards(self) -> None:
+        """Wait until the shards are connected."""
+        await self.wait_until_ready()
+
+    async def close(self) -> None:
+        """
+        Disconnect from Discord, leave the cluster and close the API pool.
+
+        Returns
+        -------
+            None
+
+        """
+        self.report_shards.cancel()
+        await super().close()
+        if (cog := self.get_cog("MatchCog")) is not None:
+            cog.heartbeat.cancel()
+            # Imported here, like the cog it belongs to.
+            from bot.cluster import cluster
+
+            await cluster.leave()
+        await http.close(api_client, api_transport)
+
 
-bot = discord.Bot(intents=discord.Intents.all())
+bot = Bot(
+    intents=discord.Intents.all(),
+    shard_count=settings.SHARD_COUNT,
+    shard_ids=settings.SHARD_IDS,
+)
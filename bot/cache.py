@@ -0,0 +1,372 @@
+"""In-process caches for API data."""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from cs2_battle_bot_api_client.api.guilds import guilds_retrieve
+from cs2_battle_bot_api_client.api.matches import matches_retrieve
+from cs2_battle_bot_api_client.models import Guild, Match
+
+from bot.logger import logger
+from bot.settings import settings
+from bot.singleflight import api_reads
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+
+class TTLCache(Generic[K, V]):
+    """Least recently used cache with per-entry time to live."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        TTL cache constructor.
+
+        Args:
+        ----
+            maxsize (int): Maximum number of entries kept.
+            ttl (float): Seconds an entry stays fresh.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of stored entries."""
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """
+        Get a fresh value and mark it as recently used.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            V | None: Cached value or None on miss.
+
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, key: K) -> V | None:
+        """
+        Get a value without touching counters, recency or expiry.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            V | None: Stored value or None.
+
+        """
+        entry = self._data.get(key)
+        return entry[1] if entry else None
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+        ----
+            key (K): Cache key.
+            value (V): Value to store.
+
+        Returns:
+        -------
+            None
+
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """
+        Remove a value.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            V | None: Removed value or None.
+
+        """
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns
+        -------
+            dict[str, int]: Hits, misses and current size.
+
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class SnapshotCache(ABC, Generic[K, V]):
+    """API objects versioned by ``updated_at`` and retrieved by one endpoint."""
+
+    name = "object"
+    endpoint: ModuleType
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Snapshot cache constructor.
+
+        Args:
+        ----
+            maxsize (int): Maximum number of objects kept.
+            ttl (float): Seconds a snapshot stays fresh.
+
+        Returns:
+        -------
+            None
+
+        """
+        self._cache: TTLCache[K, V] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    @abstractmethod
+    def key(value: V) -> K:
+        """
+        Get the cache key of an object.
+
+        Args:
+        ----
+            value (V): API object.
+
+        Returns:
+        -------
+            K: Cache key.
+
+        """
+
+    @staticmethod
+    @abstractmethod
+    def params(key: K) -> dict[str, Any]:
+        """
+        Get the arguments of the retrieve endpoint for a key.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            dict[str, Any]: Endpoint arguments other than the client.
+
+        """
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups served from memory."""
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that needed an API call."""
+        return self._cache.misses
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns
+        -------
+            dict[str, int]: Hits, misses and current size.
+
+        """
+        return self._cache.stats()
+
+    def get(self, key: K) -> V | None:
+        """
+        Get a cached snapshot.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            V | None: Cached object or None on miss.
+
+        """
+        return self._cache.get(key)
+
+    def put(self, value: V) -> None:
+        """
+        Store a snapshot unless a newer one is already cached.
+
+        Args:
+        ----
+            value (V): API object.
+
+        Returns:
+        -------
+            None
+
+        """
+        key = self.key(value)
+        cached = self._cache.peek(key)
+        if cached is not None and cached.updated_at > value.updated_at:
+            return
+        self._cache.set(key, value)
+
+    def invalidate(self, key: K) -> None:
+        """
+        Drop a cached snapshot and detach any fetch that is still running.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            None
+
+        """
+        self._cache.pop(key)
+        api_reads.forget(self.endpoint, **self.params(key))
+
+    async def fetch(self, key: K) -> V | None:
+        """
+        Get an object from the cache or the API.
+
+        Concurrent callers for the same key share one API request.
+
+        Args:
+        ----
+            key (K): Cache key.
+
+        Returns:
+        -------
+            V | None: API object or None if it does not exist.
+
+        """
+        if (value := self._cache.get(key)) is not None:
+            return value
+        # An invalidation while the request was running detaches it, so its
+        # possibly outdated result is not stored.
+        value, current = await api_reads.run(self.endpoint, **self.params(key))
+        if current and value is not None:
+            self.put(value)
+        logger.debug(f"Fetched {self.name} {key}. Cache stats: {self.stats()}")
+        return value
+
+
+class MatchCache(SnapshotCache[int, Match]):
+    """Match snapshots keyed by match id."""
+
+    name = "match"
+    endpoint = matches_retrieve
+
+    @staticmethod
+    def key(value: Match) -> int:
+        """
+        Get the cache key of a match.
+
+        Args:
+        ----
+            value (Match): Match object.
+
+        Returns:
+        -------
+            int: Match ID.
+
+        """
+        return value.id
+
+    @staticmethod
+    def params(key: int) -> dict[str, Any]:
+        """
+        Get the arguments of ``matches_retrieve`` for a match.
+
+        Args:
+        ----
+            key (int): Match ID.
+
+        Returns:
+        -------
+            dict[str, Any]: Endpoint arguments.
+
+        """
+        return {"id": key}
+
+
+class GuildCache(SnapshotCache[str, Guild]):
+    """Guild configurations keyed by Discord guild id."""
+
+    name = "guild"
+    endpoint = guilds_retrieve
+
+    @staticmethod
+    def key(value: Guild) -> str:
+        """
+        Get the cache key of a guild.
+
+        Args:
+        ----
+            value (Guild): Guild object.
+
+        Returns:
+        -------
+            str: Discord guild ID.
+
+        """
+        return value.guild_id
+
+    @staticmethod
+    def params(key: str) -> dict[str, Any]:
+        """
+        Get the arguments of ``guilds_retrieve`` for a guild.
+
+        Args:
+        ----
+            key (str): Discord guild ID.
+
+        Returns:
+        -------
+            dict[str, Any]: Endpoint arguments.
+
+        """
+        return {"guild_id": key}
+
+
+match_cache = MatchCache(
+    maxsize=settings.MATCH_CACHE_SIZE, ttl=settings.MATCH_CACHE_TTL
+)
+guild_cache = GuildCache(
+    maxsize=settings.GUILD_CACHE_SIZE, ttl=settings.GUILD_CACHE_TTL
+)
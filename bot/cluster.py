@@ -0,0 +1,310 @@
+"""Guild ownership between bot instances sharing one Redis."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+import socket
+import time
+from typing import TYPE_CHECKING
+
+from redis import ConnectionError, TimeoutError
+
+from bot.cache import TTLCache, match_cache
+from bot.logger import logger
+from bot.settings import redis_client, settings
+from bot.shards import shard_for
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from cs2_battle_bot_api_client.models import Match
+    from redis.asyncio import Redis
+
+
+def ring_hash(key: str) -> int:
+    """
+    Hash a key onto the ring.
+
+    Args:
+    ----
+        key (str): Key to hash.
+
+    Returns:
+    -------
+        int: 64 bit position, stable across processes.
+
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to instances."""
+
+    def __init__(self, nodes: Iterable[str], replicas: int) -> None:
+        """
+        Hash ring constructor.
+
+        Args:
+        ----
+            nodes (Iterable[str]): Instance ids.
+            replicas (int): Points per instance, more spread keys more evenly.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.nodes = frozenset(nodes)
+        points = sorted(
+            (ring_hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> str | None:
+        """
+        Get the instance owning a key.
+
+        Args:
+        ----
+            key (str): Key, e.g. a guild id.
+
+        Returns:
+        -------
+            str | None: Instance id or None if the ring is empty.
+
+        """
+        if not self._nodes:
+            return None
+        index = bisect.bisect(self._hashes, ring_hash(key)) % len(self._nodes)
+        return self._nodes[index]
+
+
+class Cluster:
+    """Membership of this instance and ownership of guilds and matches."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        instance_id: str,
+        key: str,
+        instance_ttl: float,
+        replicas: int,
+        shard_ids: Iterable[int] | None = None,
+        shard_count: int | None = None,
+    ) -> None:
+        """
+        Cluster constructor.
+
+        Args:
+        ----
+            redis (Redis): Async Redis client used as membership store.
+            instance_id (str): Id of this instance.
+            key (str): Sorted set of instances scored by their expiry time.
+            instance_ttl (float): Seconds an instance stays a member without
+                a heartbeat.
+            replicas (int): Ring points per instance.
+            shard_ids (Iterable[int] | None): Discord shards of this instance.
+                When set, guilds are owned by the instance running their
+                shard instead of by the ring. Several instances should set
+                it, as every instance without it receives the interactions
+                of every guild.
+            shard_count (int | None): Total number of shards.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.redis = redis
+        self.instance_id = instance_id
+        self.key = key
+        self.instance_ttl = instance_ttl
+        self.replicas = replicas
+        self.shard_ids = frozenset(shard_ids) if shard_ids is not None else None
+        self.shard_count = shard_count
+        self.skipped = 0
+        # Until the first heartbeat this instance acts alone.
+        self.ring = HashRing([instance_id], replicas)
+        self._match_guilds: TTLCache[int, str] = TTLCache(
+            maxsize=settings.MATCH_GUILD_CACHE_SIZE, ttl=settings.MATCH_GUILD_TTL
+        )
+
+    async def heartbeat(self) -> None:
+        """
+        Renew the membership of this instance and rebuild the ring on changes.
+
+        Returns
+        -------
+            None
+
+        """
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {self.instance_id: now + self.instance_ttl})
+            pipe.zremrangebyscore(self.key, "-inf", now)
+            pipe.zrange(self.key, 0, -1)
+            *_, members = await pipe.execute()
+        nodes = {member.decode() for member in members}
+        if nodes != self.ring.nodes:
+            logger.info(
+                f"Cluster members changed from {len(self.ring.nodes)} to "
+                f"{len(nodes)}, rebalancing guilds"
+            )
+            self.ring = HashRing(nodes, self.replicas)
+            if self.shared:
+                logger.warning(
+                    f"{len(nodes)} instances are running without SHARD_IDS, "
+                    "commands and interactions are handled by all of them"
+                )
+
+    @property
+    def shared(self) -> bool:
+        """Whether other instances receive the interactions of this instance."""
+        return self.shard_ids is None and len(self.ring.nodes) > 1
+
+    async def leave(self) -> None:
+        """
+        Leave the cluster so other instances take over its guilds right away.
+
+        Returns
+        -------
+            None
+
+        """
+        try:
+            await self.redis.zrem(self.key, self.instance_id)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Could not leave the cluster: {e}")
+
+    def owns_guild(self, guild_id: str) -> bool:
+        """
+        Check whether this instance handles a guild.
+
+        Args:
+        ----
+            guild_id (str): Discord guild id.
+
+        Returns:
+        -------
+            bool: Whether the guild is owned by this instance.
+
+        """
+        if self.shard_ids is not None and self.shard_count:
+            return shard_for(int(guild_id), self.shard_count) in self.shard_ids
+        return self.ring.owner(guild_id) == self.instance_id
+
+    @staticmethod
+    def _match_key(match_id: int) -> str:
+        return f"match:{match_id}:guild"
+
+    async def remember(self, match: Match) -> None:
+        """
+        Store the guild of a match so its events are routed without the API.
+
+        Args:
+        ----
+            match (Match): Match object.
+
+        Returns:
+        -------
+            None
+
+        """
+        guild_id = match.guild.guild_id
+        if self._match_guilds.peek(match.id) == guild_id:
+            return
+        self._match_guilds.set(match.id, guild_id)
+        try:
+            await self.redis.set(
+                self._match_key(match.id), guild_id, ex=int(settings.MATCH_GUILD_TTL)
+            )
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Could not store the guild of match {match.id}: {e}")
+
+    def stream_group(self, group: str) -> str:
+        """
+        Get the events stream consumer group of this instance.
+
+        Instances running a subset of the shards each read every entry in a
+        group of their own and skip the matches they do not own, as a shared
+        group could hand an entry to an instance without the guild's shard.
+
+        Args:
+        ----
+            group (str): Group shared by instances running every shard.
+
+        Returns:
+        -------
+            str: Consumer group name.
+
+        """
+        if self.shard_ids is None:
+            return group
+        return f"{group}:shards-{'-'.join(map(str, sorted(self.shard_ids)))}"
+
+    async def owns_match(self, match_id: int) -> bool:
+        """
+        Check whether this instance handles the events of a match.
+
+        The match belongs to the owner of its guild. A match whose guild is not
+        stored yet is fetched to find its guild when this instance runs a
+        subset of the shards, otherwise it belongs to the owner of its id.
+        A match that does not exist is not owned.
+
+        Args:
+        ----
+            match_id (int): Match id.
+
+        Returns:
+        -------
+            bool: Whether the match is owned by this instance.
+
+        Raises:
+        ------
+            Exception: If the match had to be fetched and the API failed.
+
+        """
+        if self.shard_ids is None and self.ring.nodes == {self.instance_id}:
+            return True
+        guild_id = self._match_guilds.get(match_id)
+        if guild_id is None:
+            try:
+                value = await self.redis.get(self._match_key(match_id))
+            except (ConnectionError, TimeoutError) as e:
+                logger.error(f"Could not get the guild of match {match_id}: {e}")
+                value = None
+            if value is not None:
+                guild_id = value.decode()
+                self._match_guilds.set(match_id, guild_id)
+        if guild_id is None and self.shard_ids is not None:
+            # Only the instance running the shard of the guild can handle the
+            # match, so every instance looks it up.
+            match = await match_cache.fetch(match_id)
+            if match is not None:
+                await self.remember(match)
+                guild_id = match.guild.guild_id
+        if guild_id is not None:
+            owned = self.owns_guild(guild_id)
+        elif self.shard_ids is not None:
+            owned = False
+        else:
+            owned = self.ring.owner(f"match:{match_id}") == self.instance_id
+        if not owned:
+            self.skipped += 1
+        return owned
+
+
+cluster = Cluster(
+    redis_client,
+    instance_id=settings.INSTANCE_ID or f"{socket.gethostname()}:{os.getpid()}",
+    key=settings.CLUSTER_KEY,
+    instance_ttl=settings.CLUSTER_INSTANCE_TTL,
+    replicas=settings.CLUSTER_RING_REPLICAS,
+    shard_ids=settings.SHARD_IDS,
+    shard_count=settings.SHARD_COUNT,
+)
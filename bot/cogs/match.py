@@ -9,13 +9,15 @@ import discord
 from cs2_battle_bot_api_client.api.account_connect_link import (
     account_connect_link_retrieve,
 )
-from cs2_battle_bot_api_client.api.guilds import guilds_retrieve
+from cs2_battle_bot_api_client.api.guilds import guilds_create
 from cs2_battle_bot_api_client.api.matches import matches_create, matches_update
 from cs2_battle_bot_api_client.errors import UnexpectedStatus
 from cs2_battle_bot_api_client.models import (
     AccountConnectLink,
+    CreateGuild,
     CreateMatch,
     CreateMatchCvars,
+    Guild,
     Match,
     MatchTypeEnum,
 )
@@ -23,31 +25,117 @@ from cs2_battle_bot_api_client.models.match_update import MatchUpdate
 from cs2_battle_bot_api_client.types import Response
 from discord.commands import option
 from discord.ext import commands, tasks
-from redis.client import PubSub
+from redis import ConnectionError, TimeoutError
+from redis.asyncio import Redis
 
+from bot.cache import guild_cache, match_cache
+from bot.cluster import cluster
 from bot.cogs.utils import create_match_embed, get_servers_list
-from bot.cogs.views import ConfigureGuildView, LaunchMatchView, MapBanView
-from bot.events.events import (
-    OnGoingLiveEvent,
-    OnMapResultEvent,
-    OnSeriesEndEvent,
-    OnSeriesStartEvent,
+from bot.cogs.views import (
+    ConfigureGuildView,
+    LaunchMatchView,
+    MapBanView,
+    dispatch_match_interaction,
 )
-from bot.events.listener import EventListener
+from bot.events import events  # noqa: F401 - registers event handlers
+from bot.events.listener import EventListener, registry
 from bot.i18n import _
 from bot.logger import logger
-from bot.settings import api_client, settings
+from bot.messages import message_resolver
+from bot.resilience import resilient_api
+from bot.settings import redis_client, settings
+from bot.singleflight import api_reads
+from bot.veto import FORMATS
+from bot.voice import voice_index
 
 
 class MatchCog(commands.Cog):
     """Match Cog."""
 
-    def __init__(self, bot: discord.Bot, pubsub: PubSub) -> None:
+    def __init__(self, bot: discord.Bot, redis: Redis) -> None:
         """Match Cog constructor."""
         self.bot = bot
-        self.pubsub = pubsub
+        self.redis = redis
+        self.event_listener = EventListener(registry.build(bot), redis=redis)
+        self.heartbeat.start()
         self.listen_events.start()
 
+    def cog_unload(self) -> None:
+        """Stop listening events when the cog is unloaded."""
+        self.listen_events.cancel()
+        self.heartbeat.cancel()
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        """Keep the voice state index up to date."""
+        voice_index.update(
+            member.guild.id, member.id, after.channel.id if after.channel else None
+        )
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        """Re-index voice states of a guild sent again by the gateway."""
+        # A new gateway session replaces the voice states without sending
+        # voice state updates, so the guild is indexed again on its next lookup.
+        voice_index.remove_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id: int) -> None:
+        """Re-index voice states of the guilds of a shard with a new session."""
+        for guild in self.bot.guilds:
+            if guild.shard_id == shard_id:
+                voice_index.remove_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction) -> None:
+        """Route clicks on persistent match views."""
+        await dispatch_match_interaction(interaction)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """
+        Handle the bot joining a guild.
+
+        Args:
+        ----
+            guild (discord.Guild): The guild the bot joined.
+
+        Returns:
+        -------
+            None: This function does not return anything.
+
+        """
+        logger.info(f"Bot joined guild: {guild.name}")
+        voice_index.remove_guild(guild.id)
+        try:
+            await guild_cache.fetch(str(guild.id))
+        except UnexpectedStatus:
+            new_guild_response: Response[Guild] = await resilient_api.call(
+                guilds_create,
+                detailed=True,
+                body=CreateGuild(
+                    guild_id=str(guild.id),
+                    name=guild.name,
+                    owner_id=str(guild.owner_id),
+                    owner_username=guild.owner.name,
+                ),
+            )
+            guild_cache.put(new_guild_response.parsed)
+            logger.info(
+                f"Guild {new_guild_response.content.decode(encoding='utf-8') } created."
+            )
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Stop tracking voice states and configuration of a guild the bot left."""
+        voice_index.remove_guild(guild.id)
+        guild_cache.invalidate(str(guild.id))
+
     match = discord.SlashCommandGroup(
         name="match", description="Commands for managing matches"
     )
@@ -66,17 +154,17 @@ class MatchCog(commands.Cog):
                 None
 
         """
-        connect_account_link: AccountConnectLink = (
-            await account_connect_link_retrieve.asyncio(
-                client=api_client,
-            )
+        # The API may be slow to answer, acknowledge the command first.
+        await ctx.defer(ephemeral=True)
+        connect_account_link: AccountConnectLink = await api_reads.call(
+            account_connect_link_retrieve
         )
         link = (
             connect_account_link.link
             if not settings.DEBUG
             else "http://localhost:8002/accounts/discord/"
         )
-        await ctx.respond(
+        await ctx.followup.send(
             f"[{_('connect_account')}]({link})",
             ephemeral=True,
         )
@@ -85,9 +173,7 @@ class MatchCog(commands.Cog):
     async def configure(self, ctx: discord.ApplicationContext) -> None:
         """Configure guild command. Select channels for lobby, team1 and team2."""
         await ctx.defer()
-        guild = await guilds_retrieve.asyncio(
-            client=api_client, guild_id=str(ctx.guild.id)
-        )
+        guild = await guild_cache.fetch(str(ctx.guild.id))
 
         if ctx.author.id != int(guild.owner.player.discord_user.user_id):
             await ctx.followup.send(_("error_user_is_not_owner"), ephemeral=True)
@@ -119,8 +205,9 @@ class MatchCog(commands.Cog):
         "match_type",
         type=str,
         choices=[
-            discord.OptionChoice(name="BO1", value="BO1"),
-            discord.OptionChoice(name="BO3", value="BO3"),
+            discord.OptionChoice(name=match_type, value=match_type)
+            for match_type in MatchTypeEnum
+            if match_type in FORMATS
         ],
         default="BO1",
     )
@@ -142,7 +229,7 @@ class MatchCog(commands.Cog):
     @option(
         "server",
         type=str,
-        autocomplete=discord.utils.basic_autocomplete(get_servers_list),
+        autocomplete=get_servers_list,
         required=False,
         description="Public available server",
     )
@@ -169,13 +256,14 @@ class MatchCog(commands.Cog):
 
         """
         await ctx.defer()
-        if not ctx.author.voice:
+        voice_channel_id = voice_index.channel_of(ctx.guild, ctx.author.id)
+        if voice_channel_id is None:
             await ctx.followup.send(
                 _("error_user_is_not_in_voice_channel"), ephemeral=True
             )
             return
 
-        members = ctx.author.voice.channel.members
+        members = voice_index.channel_members(ctx.guild, voice_channel_id)
         if not settings.DEBUG and len(members) < settings.MIN_PLAYERS:
             await ctx.followup.send(
                 _("error_min_members_count", settings.MIN_PLAYERS), ephemeral=True
@@ -183,13 +271,11 @@ class MatchCog(commands.Cog):
             return
 
         discord_users_ids = (
-            [member.id for member in members]
+            members
             if not settings.DEBUG
             else [ctx.author.id, 859429903170273321, 692055783650754650]
         )
-        guild = await guilds_retrieve.asyncio(
-            client=api_client, guild_id=str(ctx.guild.id)
-        )
+        guild = await guild_cache.fetch(str(ctx.guild.id))
         server_id = server.split(":")[1] if server else None
 
         create_match_data = CreateMatch(
@@ -204,11 +290,11 @@ class MatchCog(commands.Cog):
 
         if maplist:
             maplist_split = maplist.split(",")
-            if match_type == "BO1" and len(maplist_split) != 1:
-                await ctx.followup.send(_("error_maplist_bo1"), ephemeral=True)
-                return
-            if match_type == "BO3" and len(maplist_split) != 3:
-                await ctx.followup.send(_("error_maplist_bo3"), ephemeral=True)
+            num_maps = FORMATS[match_type].num_maps
+            if len(maplist_split) != num_maps:
+                await ctx.followup.send(
+                    _("error_maplist_count", num_maps), ephemeral=True
+                )
                 return
             create_match_data.maplist = maplist_split
 
@@ -237,8 +323,8 @@ class MatchCog(commands.Cog):
             create_match_data.cvars = CreateMatchCvars.from_dict(cvars_dict)
 
         try:
-            response: Response[Match] = await matches_create.asyncio_detailed(
-                client=api_client, body=create_match_data
+            response: Response[Match] = await resilient_api.call(
+                matches_create, detailed=True, body=create_match_data
             )
             if response.status_code != HTTPStatus.CREATED:
                 await ctx.followup.send(
@@ -265,6 +351,8 @@ class MatchCog(commands.Cog):
             return
 
         match = response.parsed
+        match_cache.put(match)
+        await cluster.remember(match)
         match_embed = create_match_embed(match)
         message = await ctx.followup.send(
             embed=match_embed,
@@ -280,20 +368,30 @@ class MatchCog(commands.Cog):
             allowed_mentions=discord.AllowedMentions(users=True, roles=True),
         )
 
+        await message_resolver.remember(message)
         logger.debug(
             f"User {ctx.author.id} created match  of type {match_type} with members {discord_users_ids}. Message id {message.id}"
         )
-        await matches_update.asyncio(
-            client=api_client, id=match.id, body=MatchUpdate(message_id=message.id)
+        await resilient_api.call(
+            matches_update, id=match.id, body=MatchUpdate(message_id=message.id)
         )
         logger.debug(f"Match updated: {message.id}")
 
-    @tasks.loop(seconds=5)
+    @tasks.loop(seconds=settings.CLUSTER_HEARTBEAT_INTERVAL)
+    async def heartbeat(self) -> None:
+        """Renew the cluster membership of this instance."""
+        try:
+            await cluster.heartbeat()
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Cluster heartbeat failed: {e}")
+
+    @tasks.loop()
     async def listen_events(self) -> None:
         """
-        Listen events. Every 5 seconds.
+        Listen events. Messages are consumed as soon as they are published.
 
-        Available events:
+        Handlers are registered with ``registry.register`` for any of the
+        ``EventType`` names:
         - going_live
         - series_start
         - series_end
@@ -312,17 +410,8 @@ class MatchCog(commands.Cog):
             None
 
         """
-        event_listener = EventListener(
-            [
-                OnGoingLiveEvent(self.bot, "going_live"),
-                OnSeriesStartEvent(self.bot, "series_start"),
-                OnSeriesEndEvent(self.bot, "series_end"),
-                OnMapResultEvent(self.bot, "map_result"),
-            ],
-            pubsub=self.pubsub,
-        )
         try:
-            await event_listener.listen()
+            await self.event_listener.listen()
         except Exception as e:
             logger.error(repr(e))
 
@@ -335,4 +424,21 @@ class MatchCog(commands.Cog):
     @listen_events.after_loop
     async def after_listen_events(self) -> None:
         """After listen events."""
+        self.event_listener.stop()
         print("Stopped listening events")
+
+
+def setup(bot: discord.Bot) -> None:
+    """
+    Register the match cog, called by ``load_extension``.
+
+    Args:
+    ----
+        bot (discord.Bot): Bot instance.
+
+    Returns:
+    -------
+        None
+
+    """
+    bot.add_cog(MatchCog(bot, redis_client))
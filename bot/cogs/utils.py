@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
+import io
+import json
+from typing import TYPE_CHECKING
+
 import discord
-from cs2_battle_bot_api_client.api.guilds import guilds_retrieve
-from cs2_battle_bot_api_client.api.servers import servers_list
 from cs2_battle_bot_api_client.models import Match
-from cs2_battle_bot_api_client.models.guild import Guild
-from cs2_battle_bot_api_client.models.paginated_server_list import PaginatedServerList
-from cs2_battle_bot_api_client.types import Response
 
+from bot.cache import TTLCache
+from bot.embeds import build_embed, current_locale, team_fields
 from bot.i18n import _
-from bot.settings import api_client, settings
+from bot.servers import server_index
+from bot.settings import settings
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+# Serialized match configs keyed by match version, as (filename, content).
+_match_configs: TTLCache[tuple[int, datetime], tuple[str, bytes]] = TTLCache(
+    maxsize=settings.MATCH_CACHE_SIZE, ttl=settings.MATCH_CONFIG_CACHE_TTL
+)
 
 
 def get_connect_account_link() -> str:
@@ -43,34 +53,81 @@ def create_match_embed(match: Match) -> discord.Embed:
         discord.Embed: Embed with match information.
 
     """
-    embed = discord.Embed(
-        title=_("embed_match_title"),
-        description=_("embed_match_desc", match.id, match.type),
-        color=discord.Colour.blurple(),
+    locale = current_locale()
+    leader_label = _("leader")
+
+    def render() -> dict:
+        return {
+            "type": "rich",
+            "title": _("embed_match_title"),
+            "description": _("embed_match_desc", match.id, match.type),
+            "color": discord.Colour.blurple().value,
+            "fields": [
+                {"name": _("maps"), "value": ", ".join(match.maplist), "inline": False}
+            ],
+        }
+
+    return build_embed(
+        (match.id, str(match.type), tuple(match.maplist), locale),
+        render,
+        [
+            team_fields(
+                team.name,
+                team.leader.discord_user.user_id,
+                [player.discord_user.user_id for player in team.players],
+                leader_label,
+            )
+            for team in (match.team1, match.team2)
+        ],
     )
 
-    teams = [match.team1, match.team2]
-    for team in teams:
-        mentioned_leader = f"<@{team.leader.discord_user.user_id}>"
-        mentioned_players = [
-            f"<@{player.discord_user.user_id}>" for player in team.players
-        ]
-        embed.add_field(
-            name=team.name,
-            value=", ".join(mentioned_players),
-            inline=False,
-        )
-        embed.add_field(
-            name=_("leader"),
-            value=mentioned_leader,
-            inline=False,
+
+def match_config_file(match: Match) -> discord.File:
+    """
+    Create the match config attachment from memory.
+
+    The serialized config is reused while the match is unchanged.
+
+    Args:
+    ----
+        match (Match): Match object.
+
+    Returns:
+    -------
+        discord.File: JSON config file.
+
+    """
+    key = (match.id, match.updated_at)
+    config = _match_configs.get(key)
+    if config is None:
+        config_dict = match.config.to_dict()
+        config = (
+            f"match_{config_dict['matchid']}.json",
+            json.dumps(config_dict, indent=4, sort_keys=False).encode("utf-8"),
         )
-    embed.add_field(
-        name=_("maps"),
-        value=", ".join(match.maplist),
-        inline=False,
-    )
-    return embed
+        _match_configs.set(key, config)
+    filename, content = config
+    return discord.File(io.BytesIO(content), filename=filename)
+
+
+async def send_ephemeral(interaction: discord.Interaction, content: str) -> None:
+    """
+    Send an ephemeral message, whether or not the interaction was answered.
+
+    Args:
+    ----
+        interaction (discord.Interaction): Interaction object.
+        content (str): Message content.
+
+    Returns:
+    -------
+        None
+
+    """
+    if interaction.response.is_done():
+        await interaction.followup.send(content, ephemeral=True)
+    else:
+        await interaction.response.send_message(content, ephemeral=True)
 
 
 async def get_servers_list(ctx: discord.AutocompleteContext) -> list[str]:
@@ -86,12 +143,4 @@ async def get_servers_list(ctx: discord.AutocompleteContext) -> list[str]:
         list[str]: List of servers.
 
     """
-    guild: Guild = await guilds_retrieve.asyncio(
-        client=api_client, guild_id=str(ctx.interaction.guild_id)
-    )
-    response: Response[PaginatedServerList] = await servers_list.asyncio_detailed(
-        client=api_client, guild_or_public=guild.id
-    )
-
-    paginated_servers = response.parsed
-    return [f"{server.name}:{server.id}" for server in paginated_servers.results]
+    return await server_index.search(str(ctx.interaction.guild_id), ctx.value or "")
@@ -2,36 +2,64 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from abc import ABC, abstractmethod
+from http import HTTPStatus
+from typing import TYPE_CHECKING
 
 import discord
-from anyio import Path
 from cs2_battle_bot_api_client.api.guilds import guilds_update
 from cs2_battle_bot_api_client.api.matches import (
     matches_ban_create,
     matches_load_create,
     matches_pick_create,
-    matches_retrieve,
     matches_shuffle_create,
 )
 from cs2_battle_bot_api_client.errors import UnexpectedStatus
-from cs2_battle_bot_api_client.models import InteractionUser, Match
+from cs2_battle_bot_api_client.models import InteractionUser, Match, Team
 from cs2_battle_bot_api_client.models.guild import Guild
 from cs2_battle_bot_api_client.models.match_ban_map import MatchBanMap
 from cs2_battle_bot_api_client.models.match_ban_map_result import MatchBanMapResult
 from cs2_battle_bot_api_client.models.match_pick_map import MatchPickMap
 from cs2_battle_bot_api_client.models.match_pick_map_result import MatchPickMapResult
-from cs2_battle_bot_api_client.models.type_enum import TypeEnum
 from cs2_battle_bot_api_client.models.update_guild import UpdateGuild
 from cs2_battle_bot_api_client.types import Response
 from discord.ui.item import Item
 from httpx import URL
 
 from bot import logger
-from bot.cogs.utils import create_match_embed
+from bot.cache import TTLCache, guild_cache, match_cache
+from bot.cogs.utils import create_match_embed, match_config_file, send_ephemeral
+from bot.guard import veto_guard
 from bot.i18n import _
-from bot.settings import api_client, settings
+from bot.messages import edit_scheduler
+from bot.resilience import ApiUnavailableError, resilient_api
+from bot.settings import settings
+from bot.veto import FORMATS, UnknownFormatError, VetoState, VetoStep
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+MATCH_CUSTOM_ID_PREFIX = "match"
+
+
+def match_custom_id(action: str, match_id: int) -> str:
+    """
+    Build the custom id of a match component.
+
+    Args:
+    ----
+        action (str): Component action.
+        match_id (int): Match ID.
+
+    Returns:
+    -------
+        str: Custom id.
+
+    """
+    return f"{MATCH_CUSTOM_ID_PREFIX}:{action}:{match_id}"
 
 
 class MatchView(ABC, discord.ui.View):
@@ -49,15 +77,17 @@ class MatchView(ABC, discord.ui.View):
                 title (str, optional): Title. Defaults to None.
 
         """
-        super().__init__()
+        super().__init__(timeout=None)
         self.match = match
         self.shuffle_team_button = discord.ui.Button(
             label=_("shuffle_teams"),
-            custom_id="shuffle-button",
+            custom_id=match_custom_id("shuffle", match.id),
             style=discord.ButtonStyle.primary,
         )
         self.shuffle_team_button.callback = self.shuffle_teams_button_callback
         self.add_item(self.shuffle_team_button)
+        # Clicks are routed by custom id, so the view is not kept in the view store.
+        self.stop()
 
     async def shuffle_teams_button_callback(
         self, interaction: discord.Interaction
@@ -77,8 +107,9 @@ class MatchView(ABC, discord.ui.View):
         """
         await interaction.response.defer()
         try:
-            response: Response[Match] = await matches_shuffle_create.asyncio_detailed(
-                client=api_client,
+            response: Response[Match] = await resilient_api.call(
+                matches_shuffle_create,
+                detailed=True,
                 id=self.match.id,
                 body=InteractionUser(interaction_user_id=interaction.user.id),
             )
@@ -88,17 +119,22 @@ class MatchView(ABC, discord.ui.View):
             )
             return
         match = response.parsed
+        match_cache.put(match)
         logger.logger.debug(f"Shuffled teams for match {match.id}")
-        await interaction.edit(embed=create_match_embed(match))
+        await edit_scheduler.schedule(
+            interaction.message, embed=create_match_embed(match)
+        )
 
 
 class MapView(MatchView):
     """Map view."""
 
+    action: str
+
     def __init__(
         self,
-        options: list[discord.SelectOption],
         match: Match,
+        options: list[discord.SelectOption] | None = None,
         title: str | None = None,
     ) -> None:
         """
@@ -114,19 +150,22 @@ class MapView(MatchView):
         super().__init__(match=match)
         self.select = discord.ui.Select(
             placeholder=title if title else _("chose_map_to_ban"),
-            options=options,
+            custom_id=match_custom_id(self.action, match.id),
+            options=options or [],
         )
         self.select.callback = self.map_select_callback
         self.add_item(self.select)
 
-    @abstractmethod
     async def map_select_callback(self, interaction: discord.Interaction) -> None:
         """
         Map select callback.
 
+        Clicks on a match run one at a time, and repeated clicks of a map by
+        the same user only reach the API once it was accepted.
+
         Args:
         ----
-                self (MapBanBO1View): MapBanBO1View object.
+                self (MapView): MapView object.
                 interaction (discord.Interaction): Interaction object.
 
         Returns:
@@ -134,130 +173,108 @@ class MapView(MatchView):
                 None
 
         """
-        raise NotImplementedError
-
-
-class MapBanView(MapView):
-    """Map ban view."""
+        await interaction.response.defer()
+        if str(self.match.type) not in FORMATS:
+            await interaction.followup.send(
+                _("error_unknown_match_type", str(self.match.type)), ephemeral=True
+            )
+            return
+        map_tag = interaction.data["values"][0]
+        succeeded, ran = await veto_guard.run(
+            self.match.id,
+            (self.match.id, interaction.user.id, self.action, map_tag),
+            lambda: self.veto(interaction, map_tag),
+        )
+        if succeeded and not ran:
+            await interaction.followup.send(
+                _("interaction_already_processed"), ephemeral=True
+            )
 
-    async def map_select_callback(self, interaction: discord.Interaction) -> None:
+    @abstractmethod
+    async def veto(self, interaction: discord.Interaction, map_tag: str) -> bool:
         """
-        BO1 map ban callback.
+        Ban or pick a map.
 
         Args:
         ----
-                self (MapBanBO1View): MapBanBO1View object.
+                self (MapView): MapView object.
                 interaction (discord.Interaction): Interaction object.
+                map_tag (str): Map tag.
 
         Returns:
         -------
-                None
+                bool: Whether the API accepted the ban or pick.
 
         """
-        await interaction.response.defer()
-        match = self.match
-        map_tag = interaction.data["values"][0]
-        match match.type:
-            case TypeEnum.BO1:
-                await self.bo1_map_ban_logic(interaction, match, map_tag)
-            case TypeEnum.BO3:
-                await self.bo3_map_ban_logic(interaction, match, map_tag)
+        raise NotImplementedError
 
-    async def bo1_map_ban_logic(
-        self,
-        interaction: discord.Interaction,
-        match: Match,
-        map_tag: str,
+    def veto_state(self) -> VetoState:
+        """
+        Get the latest known veto state of the match.
+
+        Returns
+        -------
+                VetoState: State shown after the last ban or pick, or the state
+                    of the match if it is more recent.
+
+        """
+        state = VetoState.from_match(self.match)
+        latest = _veto_states.get(self.match.id)
+        return (
+            latest if latest is not None and latest.actions > state.actions else state
+        )
+
+    async def advance(
+        self, interaction: discord.Interaction, state: VetoState, next_team: Team
     ) -> None:
         """
-        BO1 map ban logic.
+        Show the next veto step without retrieving the match again.
+
+        The match is reconciled with the API in the background.
 
         Args:
         ----
-                self (MapBanView): MapBanView object.
                 interaction (discord.Interaction): Interaction object.
-                match (Match): Match object.
-                map_tag (str): Map tag.
+                state (VetoState): Veto state after the ban or pick.
+                next_team (Team): Team whose turn it is.
 
         Returns:
         -------
                 None
 
         """
-        interaction_user_id = (
-            interaction.user.id
-            if not settings.DEBUG
-            else match.team1.leader.discord_user.user_id
-            if len(match.map_bans) == 0
-            else match.team1.leader.discord_user.user_id
-            if match.last_map_ban.team == match.team2
-            else match.team2.leader.discord_user.user_id
+        match = state.apply(self.match)
+        _veto_states.set(match.id, state)
+        # Not awaited, so the match lock is released before the edit is sent.
+        edit_scheduler.schedule(
+            interaction.message,
+            embed=create_match_embed(match),
+            view=veto_view(match, state, next_team),
         )
+        reconcile_veto(interaction.message, match.id, state)
 
-        try:
-            response: Response[
-                MatchBanMapResult
-            ] = await matches_ban_create.asyncio_detailed(
-                client=api_client,
-                id=match.id,
-                body=MatchBanMap(
-                    interaction_user_id=interaction_user_id, map_tag=map_tag
-                ),
-            )
-        except UnexpectedStatus as err:
-            try:
-                data = json.loads(err.content.decode(encoding="utf-8"))
-            except json.JSONDecodeError:
-                data = err.content.decode(encoding="utf-8")
-            await interaction.followup.send(data)
-            return
-
-        await interaction.followup.send(
-            _("user_ban_map", f"<@{interaction_user_id}>", map_tag)
-        )
 
-        ban_result = response.parsed
-        updated_match = await matches_retrieve.asyncio(client=api_client, id=match.id)
-        match_embed = create_match_embed(updated_match)
-        view = (
-            LaunchMatchView(timeout=None, match=updated_match)
-            if len(ban_result.maps_left) == 1
-            else MapBanView(
-                title=_(
-                    "user_is_banning",
-                    ban_result.next_ban_team.leader.discord_user.username,
-                ),
-                options=[
-                    discord.SelectOption(label=tag, value=tag)
-                    for tag in ban_result.maps_left
-                ],
-                match=updated_match,
-            )
-        )
+class MapBanView(MapView):
+    """Map ban view."""
 
-        await interaction.message.edit(embed=match_embed, view=view)
+    action = "ban"
 
-    async def bo3_map_ban_logic(
-        self,
-        interaction: discord.Interaction,
-        match: Match,
-        map_tag: str,
-    ) -> None:
+    async def veto(self, interaction: discord.Interaction, map_tag: str) -> bool:
         """
-        Map ban logic for BO3 matches.
+        Ban a map, for every veto format.
 
         Args:
         ----
                 self (MapBanView): MapBanView object.
                 interaction (discord.Interaction): Interaction object.
-                match (Match): Match object.
                 map_tag (str): Map tag.
 
         Returns:
         -------
-                None
+                bool: Whether the API accepted the ban or pick.
 
         """
+        match = self.match
         interaction_user_id = (
             interaction.user.id
             if not settings.DEBUG
@@ -269,77 +286,62 @@ class MapBanView(MapView):
         )
 
         try:
-            response = await matches_ban_create.asyncio_detailed(
-                client=api_client,
+            response: Response[MatchBanMapResult] = await resilient_api.call(
+                matches_ban_create,
+                detailed=True,
                 id=match.id,
                 body=MatchBanMap(
                     interaction_user_id=interaction_user_id, map_tag=map_tag
                 ),
             )
+        except ApiUnavailableError:
+            # The request may have reached the API before the deadline.
+            reconcile_veto(interaction.message, match.id, self.veto_state())
+            raise
         except UnexpectedStatus as err:
-            await interaction.followup.send(
-                json.loads(err.content.decode(encoding="utf-8"))["message"]
-            )
-            return
+            try:
+                data = json.loads(err.content.decode(encoding="utf-8"))
+            except json.JSONDecodeError:
+                data = err.content.decode(encoding="utf-8")
+            if isinstance(data, dict):
+                data = data.get("message", data)
+            await interaction.followup.send(data)
+            return False
 
         await interaction.followup.send(
             _("user_ban_map", f"<@{interaction_user_id}>", map_tag)
         )
 
-        ban_result = response.parsed
-        updated_match = await matches_retrieve.asyncio(client=api_client, id=match.id)
-        match_embed = create_match_embed(updated_match)
-        if len(updated_match.maplist) == 3:
-            view = LaunchMatchView(timeout=None, match=updated_match)
-        elif ban_result.map_bans_count == 2 and len(updated_match.map_picks) < 2:
-            view = MapPickView(
-                title=_(
-                    "user_is_picking",
-                    ban_result.next_ban_team.leader.discord_user.username,
-                ),
-                options=[
-                    discord.SelectOption(label=tag, value=tag)
-                    for tag in ban_result.maps_left
-                ],
-                match=updated_match,
-            )
-        else:
-            view = MapBanView(
-                title=_(
-                    "user_is_banning",
-                    ban_result.next_ban_team.leader.discord_user.username,
-                ),
-                options=[
-                    discord.SelectOption(label=tag, value=tag)
-                    for tag in ban_result.maps_left
-                ],
-                match=updated_match,
-            )
-
-        await interaction.message.edit(embed=match_embed, view=view)
+        ban_result: MatchBanMapResult = response.parsed
+        await self.advance(
+            interaction,
+            self.veto_state().ban(map_tag, ban_result.maps_left),
+            ban_result.next_ban_team,
+        )
+        return True
 
 
 class MapPickView(MapView):
     """Map pick view."""
 
-    async def map_select_callback(self, interaction: discord.Interaction) -> None:
+    action = "pick"
+
+    async def veto(self, interaction: discord.Interaction, map_tag: str) -> bool:
         """
-        Map select callback.
+        Pick a map.
 
         Args:
         ----
                 self (MapPickView): MapPickView object.
                 interaction (discord.Interaction): Interaction object.
+                map_tag (str): Map tag.
 
         Returns:
         -------
-                None
+                bool: Whether the API accepted the ban or pick.
 
         """
-        await interaction.response.defer()
         match = self.match
-        map_tag = interaction.data["values"][0]
-
         interaction_user_id = (
             interaction.user.id
             if not settings.DEBUG
@@ -351,54 +353,35 @@ class MapPickView(MapView):
         )
 
         try:
-            response: Response[
-                MatchPickMapResult
-            ] = await matches_pick_create.asyncio_detailed(
-                client=api_client,
+            response: Response[MatchPickMapResult] = await resilient_api.call(
+                matches_pick_create,
+                detailed=True,
                 id=match.id,
                 body=MatchPickMap(
                     interaction_user_id=interaction_user_id, map_tag=map_tag
                 ),
             )
+        except ApiUnavailableError:
+            # The request may have reached the API before the deadline.
+            reconcile_veto(interaction.message, match.id, self.veto_state())
+            raise
         except UnexpectedStatus as err:
             await interaction.followup.send(
                 json.loads(err.content.decode(encoding="utf-8"))["message"]
             )
-            return
+            return False
 
         await interaction.followup.send(
             _("user_pick_map", f"<@{interaction_user_id}>", map_tag)
         )
 
-        pick_result = response.parsed
-
-        updated_match = await matches_retrieve.asyncio(client=api_client, id=match.id)
-
-        await interaction.message.edit(
-            view=MapPickView(
-                title=_(
-                    "user_is_picking",
-                    pick_result.next_pick_team.leader.discord_user.username,
-                ),
-                options=[
-                    discord.SelectOption(label=map, value=map)
-                    for map in pick_result.maps_left
-                ],
-                match=updated_match,
-            )
-            if pick_result.map_picks_count < 2
-            else MapBanView(
-                title=_(
-                    "user_is_banning",
-                    pick_result.next_pick_team.leader.discord_user.username,
-                ),
-                options=[
-                    discord.SelectOption(label=map, value=map)
-                    for map in pick_result.maps_left
-                ],
-                match=updated_match,
-            )
+        pick_result: MatchPickMapResult = response.parsed
+        await self.advance(
+            interaction,
+            self.veto_state().pick(map_tag, pick_result.maps_left),
+            pick_result.next_pick_team,
         )
+        return True
 
 
 class LaunchMatchView(discord.ui.View):
@@ -438,10 +421,12 @@ class LaunchMatchView(discord.ui.View):
             )
             self.add_item(join_btn)
         self.match = match
+        self.start_match_button_callback.custom_id = match_custom_id("start", match.id)
+        # Clicks are routed by custom id, so the view is not kept in the view store.
+        self.stop()
 
     @discord.ui.button(
         label="Start!",
-        custom_id="start-button",
         style=discord.ButtonStyle.primary,
         emoji="🚀",
     )
@@ -468,18 +453,7 @@ class LaunchMatchView(discord.ui.View):
                 _("error_user_is_no_author_of_match"), ephemeral=True
             )
             return
-        config_dict = self.match.config.to_dict()
-        config_string = json.dumps(config_dict, indent=4, sort_keys=False)
-        config_filename = (
-            Path(__file__).parent.parent
-            / "temp"
-            / f"match_{config_dict['matchid']}.json"
-        )
-        config_path = Path(config_filename)
-        async with await config_path.open("w") as f:
-            await f.write(config_string)
-        file = discord.File(config_filename)
-        await Path.unlink(config_filename)
+        file = match_config_file(self.match)
         if self.match.server is None:
             await interaction.followup.send(
                 _("success_match_loaded_without_server", self.match.load_match_command),
@@ -488,8 +462,11 @@ class LaunchMatchView(discord.ui.View):
             )
         else:
             try:
-                await matches_load_create.asyncio_detailed(
-                    client=api_client, id=self.match.id, body=self.match
+                await resilient_api.call(
+                    matches_load_create,
+                    detailed=True,
+                    id=self.match.id,
+                    body=self.match,
                 )
             except UnexpectedStatus as err:
                 await interaction.followup.send(
@@ -533,6 +510,29 @@ class ConfigureGuildView(discord.ui.View):
         super().__init__(*items, timeout=timeout, disable_on_timeout=disable_on_timeout)
         self.guild = guild
 
+    async def on_error(
+        self, error: Exception, item: Item, interaction: discord.Interaction
+    ) -> None:
+        """
+        Tell the user when the API is unavailable.
+
+        Args:
+        ----
+                error (Exception): Raised error.
+                item (Item): Item that failed.
+                interaction (discord.Interaction): Interaction object.
+
+        Returns:
+        -------
+                None
+
+        """
+        if not isinstance(error, ApiUnavailableError):
+            await super().on_error(error, item, interaction)
+            return
+        logger.logger.warning(repr(error))
+        await send_ephemeral(interaction, _("error_api_unavailable"))
+
     @discord.ui.channel_select(
         placeholder="Select channel for Lobby",
         channel_types=[discord.ChannelType.voice],
@@ -565,12 +565,14 @@ class ConfigureGuildView(discord.ui.View):
             f"Channel lobby set to {channel}", ephemeral=True
         )
 
-        response: Response[Guild] = await guilds_update.asyncio_detailed(
-            client=api_client,
+        response: Response[Guild] = await resilient_api.call(
+            guilds_update,
+            detailed=True,
             guild_id=self.guild.guild_id,
             body=UpdateGuild(lobby_channel=channel.id),
         )
         updated_guild = response.parsed
+        guild_cache.put(updated_guild)
 
         logger.logger.debug(f"Updated guild: {updated_guild}")
 
@@ -607,12 +609,14 @@ class ConfigureGuildView(discord.ui.View):
             f"Channel Team 1 set to {channel}", ephemeral=True
         )
 
-        response: Response[Guild] = await guilds_update.asyncio_detailed(
-            client=api_client,
+        response: Response[Guild] = await resilient_api.call(
+            guilds_update,
+            detailed=True,
             guild_id=self.guild.guild_id,
             body=UpdateGuild(team1_channel=channel.id),
         )
         updated_guild = response.parsed
+        guild_cache.put(updated_guild)
 
         logger.logger.debug(f"Updated guild: {updated_guild}")
 
@@ -648,11 +652,174 @@ class ConfigureGuildView(discord.ui.View):
             f"Channel Team 2 set to {channel}", ephemeral=True
         )
 
-        response: Response[Guild] = await guilds_update.asyncio_detailed(
-            client=api_client,
+        response: Response[Guild] = await resilient_api.call(
+            guilds_update,
+            detailed=True,
             guild_id=self.guild.guild_id,
             body=UpdateGuild(team2_channel=channel.id),
         )
         updated_guild = response.parsed
+        guild_cache.put(updated_guild)
 
         logger.logger.debug(f"Updated guild: {updated_guild}")
+
+
+def veto_view(match: Match, state: VetoState, next_team: Team) -> discord.ui.View:
+    """
+    Build the view of the next veto step.
+
+    Args:
+    ----
+        match (Match): Match object.
+        state (VetoState): Veto state.
+        next_team (Team): Team whose turn it is.
+
+    Returns:
+    -------
+        discord.ui.View: Ban, pick or launch view.
+
+    """
+    if state.step == VetoStep.LAUNCH:
+        return LaunchMatchView(timeout=None, match=match)
+    options = [discord.SelectOption(label=tag, value=tag) for tag in state.maps_left]
+    leader = next_team.leader.discord_user.username
+    if state.step == VetoStep.PICK:
+        return MapPickView(
+            title=_("user_is_picking", leader), options=options, match=match
+        )
+    return MapBanView(title=_("user_is_banning", leader), options=options, match=match)
+
+
+def next_veto_team(match: Match) -> Team:
+    """
+    Get the team whose turn it is, based on the last ban or pick.
+
+    Args:
+    ----
+        match (Match): Match object.
+
+    Returns:
+    -------
+        Team: Team.
+
+    """
+    actions = [*match.map_bans, *match.map_picks]
+    if not actions:
+        return match.team1
+    last = max(actions, key=lambda action: action.created_at)
+    return match.team2 if last.team.id == match.team1.id else match.team1
+
+
+# Latest veto state shown for each match, ahead of the match cache until the
+# background reconciliation finishes.
+_veto_states: TTLCache[int, VetoState] = TTLCache(
+    maxsize=settings.MATCH_CACHE_SIZE, ttl=settings.MATCH_CACHE_TTL
+)
+
+# Reconciliations running in the background, referenced until they finish.
+_reconciliations: set[asyncio.Task] = set()
+
+
+async def _reconcile_veto(
+    message: discord.Message, match_id: int, expected: VetoState
+) -> None:
+    match_cache.invalidate(match_id)
+    try:
+        match = await match_cache.fetch(match_id)
+    except ApiUnavailableError as e:
+        logger.logger.warning(f"Could not reconcile veto of match {match_id}: {e}")
+        return
+    if match is None:
+        return
+    try:
+        state = VetoState.from_match(match)
+    except UnknownFormatError as e:
+        logger.logger.warning(repr(e))
+        return
+    latest = _veto_states.peek(match_id)
+    if latest is not None and state.actions < latest.actions:
+        # A later click already advanced the message; its own
+        # reconciliation is the one to apply.
+        return
+    _veto_states.set(match_id, state)
+    view = None
+    if not state.same_veto(expected):
+        logger.logger.warning(
+            f"Veto of match {match_id} differs from the API: {expected} != {state}"
+        )
+        view = veto_view(match, state, next_veto_team(match))
+    await edit_scheduler.schedule(message, embed=create_match_embed(match), view=view)
+
+
+def reconcile_veto(message: discord.Message, match_id: int, state: VetoState) -> None:
+    """
+    Refresh a match in the background and correct its message if needed.
+
+    Args:
+    ----
+        message (discord.Message): Match message.
+        match_id (int): Match ID.
+        state (VetoState): Veto state shown in the message.
+
+    Returns:
+    -------
+        None
+
+    """
+    task = asyncio.create_task(_reconcile_veto(message, match_id, state))
+    _reconciliations.add(task)
+    task.add_done_callback(_reconciliations.discard)
+
+
+# Action of a match component -> callback of a view built for the clicked match.
+MATCH_ROUTES: dict[
+    str, Callable[[Match], Callable[[discord.Interaction], Awaitable[None]]]
+] = {
+    "shuffle": lambda match: MatchView(match).shuffle_teams_button_callback,
+    "ban": lambda match: MapBanView(match).map_select_callback,
+    "pick": lambda match: MapPickView(match).map_select_callback,
+    "start": lambda match: LaunchMatchView(
+        match=match
+    ).start_match_button_callback.callback,
+}
+
+
+async def dispatch_match_interaction(interaction: discord.Interaction) -> bool:
+    """
+    Route a click on a match component to its view.
+
+    The match is resolved lazily from the custom id through the match cache.
+
+    Args:
+    ----
+            interaction (discord.Interaction): Interaction object.
+
+    Returns:
+    -------
+            bool: Whether the interaction belonged to a match component.
+
+    """
+    if interaction.type != discord.InteractionType.component:
+        return False
+    parts = (interaction.custom_id or "").split(":")
+    if len(parts) != 3 or parts[0] != MATCH_CUSTOM_ID_PREFIX:
+        return False
+    route = MATCH_ROUTES.get(parts[1])
+    if route is None or not parts[2].isdigit():
+        return False
+    try:
+        try:
+            match = await match_cache.fetch(int(parts[2]))
+        except UnexpectedStatus as e:
+            # The client raises instead of returning None for a deleted match.
+            if e.status_code != HTTPStatus.NOT_FOUND:
+                raise
+            match = None
+        if match is None:
+            await send_ephemeral(interaction, _("error_match_not_found"))
+            return True
+        await route(match)(interaction)
+    except ApiUnavailableError as e:
+        logger.logger.warning(repr(e))
+        await send_ephemeral(interaction, _("error_api_unavailable"))
+    return True
@@ -0,0 +1,98 @@
+"""Memoized rendering of match embeds."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import discord
+from pycord.i18n import I18n
+
+from bot.cache import TTLCache
+from bot.settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Sequence
+
+_match_parts: TTLCache[Hashable, dict] = TTLCache(
+    maxsize=settings.EMBED_CACHE_SIZE, ttl=settings.EMBED_CACHE_TTL
+)
+_team_fields: TTLCache[Hashable, list[dict]] = TTLCache(
+    maxsize=settings.EMBED_CACHE_SIZE, ttl=settings.EMBED_CACHE_TTL
+)
+
+
+def current_locale() -> str | None:
+    """
+    Get the locale translations are currently rendered in.
+
+    Returns
+    -------
+        str | None: Locale or None before the first command was invoked.
+
+    """
+    return getattr(I18n.instance, "current_locale", None)
+
+
+def team_fields(
+    name: str,
+    leader_id: int | str,
+    player_ids: Sequence[int | str],
+    leader_label: str,
+) -> list[dict]:
+    """
+    Render the embed fields of a team, reusing them while the team is unchanged.
+
+    Args:
+    ----
+        name (str): Team name.
+        leader_id (int | str): Discord user id of the leader.
+        player_ids (Sequence[int | str]): Discord user ids of the players.
+        leader_label (str): Translated name of the leader field.
+
+    Returns:
+    -------
+        list[dict]: Players and leader fields.
+
+    """
+    key = (name, leader_id, tuple(player_ids), leader_label)
+    fields = _team_fields.get(key)
+    if fields is None:
+        fields = [
+            {
+                "name": name,
+                "value": ", ".join(f"<@{player_id}>" for player_id in player_ids),
+                "inline": False,
+            },
+            {"name": leader_label, "value": f"<@{leader_id}>", "inline": False},
+        ]
+        _team_fields.set(key, fields)
+    return fields
+
+
+def build_embed(
+    key: Hashable,
+    render: Callable[[], dict],
+    teams: Sequence[list[dict]],
+) -> discord.Embed:
+    """
+    Build an embed from memoized parts.
+
+    Args:
+    ----
+        key (Hashable): Version of the match specific parts, e.g. match id,
+            update time and locale.
+        render (Callable[[], dict]): Renders the match specific parts as an
+            embed dict whose ``fields`` are placed after the team fields.
+        teams (Sequence[list[dict]]): Team fields from ``team_fields``.
+
+    Returns:
+    -------
+        discord.Embed: Embed.
+
+    """
+    parts = _match_parts.get(key)
+    if parts is None:
+        parts = render()
+        _match_parts.set(key, parts)
+    fields = [field for team in teams for field in team]
+    return discord.Embed.from_dict({**parts, "fields": fields + parts["fields"]})
@@ -1,10 +1,13 @@
 """Going live event."""
+
 from cs2_battle_bot_api_client.models import Match
 
-from bot.events.listener import Event
+from bot.events.listener import Event, EventType, registry
 from bot.logger import logger
+from bot.voice import move_members
 
 
+@registry.register(EventType.SERIES_START)
 class OnSeriesStartEvent(Event):
     """Series start event."""
 
@@ -22,12 +25,14 @@ class OnSeriesStartEvent(Event):
 
         """
         logger.debug(f"Series start event callback with data: {data}")
-        match = Match.from_dict(data.get("match"))
+        match: Match = data["match"]
         await self.move_players_to_lobby(match)
-        message = self.bot.get_message(int(match.message_id))
-        await message.reply(f"Series with match id {match.id} has started. Good luck!")
+        await self.reply(
+            match, f"Series with match id {match.id} has started. Good luck!"
+        )
 
 
+@registry.register(EventType.SERIES_END)
 class OnSeriesEndEvent(Event):
     """Series end event."""
 
@@ -44,12 +49,14 @@ class OnSeriesEndEvent(Event):
             None
 
         """
-        match = Match.from_dict(data.get("match"))
+        match: Match = data["match"]
         await self.move_players_to_lobby(match)
-        message = self.bot.get_message(int(match.message_id))
-        await message.reply(f"Series with match id {match.id} has ended. Good game!")
+        await self.reply(
+            match, f"Series with match id {match.id} has ended. Good game!"
+        )
 
 
+@registry.register(EventType.GOING_LIVE)
 class OnGoingLiveEvent(Event):
     """Going live event."""
 
@@ -67,32 +74,21 @@ class OnGoingLiveEvent(Event):
 
         """
         logger.debug(f"Going live event callback with data: {data}")
-        match = Match.from_dict(data.get("match"))
-        guild = self.bot.get_guild(int(match.guild.guild_id))
+        match: Match = data["match"]
+        guild = self.get_guild(match)
+        if guild is None:
+            return
         team1_channel = guild.get_channel(int(match.guild.team1_channel))
         team2_channel = guild.get_channel(int(match.guild.team2_channel))
-        team1_members = [
-            guild.get_member(int(player.discord_user.user_id))
-            for player in match.team1.players
-        ]
-        team2_members = [
-            guild.get_member(int(player.discord_user.user_id))
-            for player in match.team2.players
-        ]
-        logger.debug(f"Available members in team 1: {team1_members}")
-        logger.debug(f"Available members in team 2: {team2_members}")
-        for member in team1_members:
-            if member and member.voice:
-                await member.move_to(team1_channel)
-                logger.debug(f"Moved {member} to {team1_channel} channel")
-        for member in team2_members:
-            if member and member.voice:
-                await member.move_to(team2_channel)
-                logger.debug(f"Moved {member} to {team2_channel} channel")
-        message = self.bot.get_message(int(match.message_id))
-        await message.reply(f"Match with id {match.id} has going live. Good luck!")
+        await move_members(
+            guild,
+            dict.fromkeys(self.get_user_ids(match.team1), team1_channel)
+            | dict.fromkeys(self.get_user_ids(match.team2), team2_channel),
+        )
+        await self.reply(match, f"Match with id {match.id} has going live. Good luck!")
 
 
+@registry.register(EventType.MAP_RESULT)
 class OnMapResultEvent(Event):
     """Map result event."""
 
@@ -110,20 +106,22 @@ class OnMapResultEvent(Event):
 
         """
         logger.debug(f"Map result event callback with data: {data}")
-        match = Match.from_dict(data.get("match"))
+        match: Match = data["match"]
         await self.move_players_to_lobby(match)
         map_number = data.get("map_number")
         map_ = match.maplist[map_number]
         num_maps = match.num_maps
-        message = self.bot.get_message(int(match.message_id))
         if map_number < num_maps:
             try:
-                await message.reply(
-                    f"Map {map_} has ended. Good game! Next map is {match.maplist[map_number + 1]}"
+                await self.reply(
+                    match,
+                    f"Map {map_} has ended. Good game! Next map is {match.maplist[map_number + 1]}",
                 )
             except IndexError:
-                await message.reply(
-                    f"Map {map_} has ended. Good game! Series has ended."
+                await self.reply(
+                    match, f"Map {map_} has ended. Good game! Series has ended."
                 )
         else:
-            await message.reply(f"Map {map_} has ended. Good game! Series has ended.")
+            await self.reply(
+                match, f"Map {map_} has ended. Good game! Series has ended."
+            )
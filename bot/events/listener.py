@@ -2,28 +2,72 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from enum import StrEnum
+from typing import TYPE_CHECKING
 
 import discord
-from cs2_battle_bot_api_client.api.matches import matches_retrieve
-from redis.client import PubSub
+from cs2_battle_bot_api_client.models import Match, Team
+from redis import ConnectionError, ResponseError, TimeoutError
+from redis.asyncio import Redis
 
+from bot.cache import match_cache
+from bot.cluster import cluster
 from bot.logger import logger
-from bot.schemas import Match
-from bot.settings import api_client
+from bot.messages import message_resolver
+from bot.resilience import ApiUnavailableError
+from bot.settings import settings
+from bot.shards import shard_for
+from bot.voice import move_members
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+EVENTS_PATTERN = "event.*"
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 30
+
+
+class EventType(StrEnum):
+    """Event names published by the API."""
+
+    GOING_LIVE = "going_live"
+    SERIES_START = "series_start"
+    SERIES_END = "series_end"
+    MAP_RESULT = "map_result"
+    ROUND_END = "round_end"
+    SIDE_PICKED = "side_picked"
+    MAP_PICKED = "map_picked"
+    MAP_VETOED = "map_vetoed"
+
+
+# Events after which a previously fetched match snapshot is outdated.
+STATE_CHANGING_EVENTS = frozenset(EventType) - {EventType.ROUND_END}
+# Events that are always dispatched, even when a newer one of the same type follows.
+MILESTONE_EVENTS = frozenset(
+    {
+        EventType.GOING_LIVE,
+        EventType.SERIES_START,
+        EventType.SERIES_END,
+        EventType.MAP_RESULT,
+    }
+)
 
 
 class Event(ABC):
     """Base class for events."""
 
-    def __init__(self, bot: discord.Bot, name: str) -> None:
+    def __init__(self, bot: discord.AutoShardedBot, name: str) -> None:
         """
         Event constructor.
 
         Args:
         ----
-            bot (discord.Bot): Bot instance.
+            bot (discord.AutoShardedBot): Bot instance.
             name (str): Event name.
             matchid (int): Match ID.
 
@@ -35,7 +79,48 @@ class Event(ABC):
         self.bot = bot
         self.name = name
 
-    async def move_players_to_lobby(self, match: Match) -> discord.VoiceChannel:
+    @staticmethod
+    def get_user_ids(team: Team) -> set[int]:
+        """
+        Get discord user ids of team players.
+
+        Args:
+        ----
+            team (Team): Team object.
+
+        Returns:
+        -------
+            set[int]: Discord user ids.
+
+        """
+        return {int(player.discord_user.user_id) for player in team.players}
+
+    def get_guild(self, match: Match) -> discord.Guild | None:
+        """
+        Get the guild of a match from the shard it belongs to.
+
+        Args:
+        ----
+            match (Match): Match object.
+
+        Returns:
+        -------
+            discord.Guild | None: Guild or None if its shard is not connected
+                in this process.
+
+        """
+        guild_id = int(match.guild.guild_id)
+        shard_id = shard_for(guild_id, self.bot.shard_count or 1)
+        shard = self.bot.get_shard(shard_id)
+        if shard is None or shard.is_closed():
+            logger.warning(
+                f"Shard {shard_id} of guild {guild_id} is not connected, "
+                f"skipping match {match.id}"
+            )
+            return None
+        return self.bot.get_guild(guild_id)
+
+    async def move_players_to_lobby(self, match: Match) -> discord.VoiceChannel | None:
         """
         Move players to lobby.
 
@@ -45,22 +130,40 @@ class Event(ABC):
 
         Returns:
         -------
-            discord.VoiceChannel: Voice channel.
+            discord.VoiceChannel | None: Voice channel or None if the guild is
+                not available.
 
         """
-        guild = self.bot.get_guild(int(match.guild.guild_id))
+        guild = self.get_guild(match)
+        if guild is None:
+            return None
         channel = guild.get_channel(int(match.guild.lobby_channel))
-        players = [
-            guild.get_member(int(player.discord_user.user_id))
-            for player in match.team1.players + match.team2.players
-        ]
-        logger.debug(f"Available players: {players}")
-        for player in players:
-            if player and player.voice:
-                await player.move_to(channel)
-                logger.debug(f"Moved player {player} to channel {channel}")
+        players = self.get_user_ids(match.team1) | self.get_user_ids(match.team2)
+        await move_members(guild, dict.fromkeys(players, channel))
         return channel
 
+    async def reply(self, match: Match, content: str) -> None:
+        """
+        Reply to the match message.
+
+        Args:
+        ----
+            match (Match): Match object.
+            content (str): Reply content.
+
+        Returns:
+        -------
+            None
+
+        """
+        if not match.message_id:
+            logger.error(f"Match {match.id} has no message to reply to")
+            return
+        message = await message_resolver.resolve(int(match.message_id))
+        if message is None:
+            return
+        await message.reply(content)
+
     @abstractmethod
     async def callback(self, *args: any, **kwargs: any) -> None:
         """
@@ -79,17 +182,106 @@ class Event(ABC):
         raise NotImplementedError
 
 
+class EventRegistry:
+    """Registry mapping event names to their handlers."""
+
+    def __init__(self) -> None:
+        """Event registry constructor."""
+        self._handlers: defaultdict[str, list[type[Event]]] = defaultdict(list)
+
+    def register(self, name: EventType) -> Callable[[type[Event]], type[Event]]:
+        """
+        Register an event handler class for the given event name.
+
+        Args:
+        ----
+            name (EventType): Event name.
+
+        Returns:
+        -------
+            Callable[[type[Event]], type[Event]]: Class decorator.
+
+        """
+
+        def decorator(cls: type[Event]) -> type[Event]:
+            self._handlers[name].append(cls)
+            return cls
+
+        return decorator
+
+    def build(self, bot: discord.Bot) -> dict[str, tuple[Event, ...]]:
+        """
+        Instantiate every registered handler once.
+
+        Args:
+        ----
+            bot (discord.Bot): Bot instance.
+
+        Returns:
+        -------
+            dict[str, tuple[Event, ...]]: Handlers keyed by event name.
+
+        """
+        return {
+            name: tuple(cls(bot, name) for cls in handlers)
+            for name, handlers in self._handlers.items()
+        }
+
+
+registry = EventRegistry()
+
+
+class QueuedEvent:
+    """Event waiting in a match queue."""
+
+    __slots__ = ("data", "entry_ids", "deadline", "started")
+
+    def __init__(self, data: dict, deadline: float) -> None:
+        """
+        Queued event constructor.
+
+        Args:
+        ----
+            data (dict): Event data.
+            deadline (float): Monotonic time until newer events may replace the data.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.data = data
+        self.entry_ids: list[bytes] = []
+        self.deadline = deadline
+        self.started = False
+
+
 class EventListener:
     """Event listener for the bot."""
 
-    def __init__(self, events: list[Event], pubsub: PubSub) -> None:
+    def __init__(
+        self,
+        events: dict[str, tuple[Event, ...]],
+        redis: Redis,
+        pattern: str = EVENTS_PATTERN,
+        stream: str = settings.EVENTS_STREAM,
+        max_concurrency: int = settings.EVENTS_MAX_CONCURRENCY,
+        idle_timeout: float = settings.EVENTS_QUEUE_IDLE_TIMEOUT,
+        coalesce_window: float = settings.EVENTS_COALESCE_WINDOW,
+    ) -> None:
         """
         Event listener constructor.
 
         Args:
         ----
-            events (list[Event]): List of events.
-            pubsub (PubSub): Redis pubsub instance.
+            events (dict[str, tuple[Event, ...]]): Handlers keyed by event name.
+            redis (Redis): Async Redis client.
+            pattern (str): Channel pattern to subscribe to.
+            stream (str): Stream to consume. Empty to use pubsub only.
+            max_concurrency (int): Maximum number of matches handled at once.
+            idle_timeout (float): Seconds after which an idle match queue is dropped.
+            coalesce_window (float): Seconds a non-milestone event waits for a
+                newer one of the same type to replace it. 0 disables coalescing.
 
         Returns:
         -------
@@ -97,7 +289,26 @@ class EventListener:
 
         """
         self.events = events
-        self.pubsub = pubsub
+        self.redis = redis
+        self.pattern = pattern
+        self.stream = stream
+        self.group = cluster.stream_group(settings.EVENTS_STREAM_GROUP)
+        # One consumer per process, so processes on one host never claim
+        # each other's in-flight entries.
+        self.consumer = settings.EVENTS_STREAM_CONSUMER or cluster.instance_id
+        self.idle_timeout = idle_timeout
+        self.coalesce_window = coalesce_window
+        self.coalesced = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: dict[int, asyncio.Queue[QueuedEvent]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._tails: dict[int, QueuedEvent] = {}
+        self._reconnect_delay = RECONNECT_MIN_DELAY
+        # Stream entries queued or running in this process and their failed attempts.
+        self._entries: set[bytes] = set()
+        self._attempts: dict[bytes, int] = {}
+        # Acknowledgements of skipped entries, referenced until they finish.
+        self._acks: set[asyncio.Task] = set()
 
     async def dispatch(self, event: str, *args: any, **kwargs: any) -> None:
         """
@@ -114,30 +325,310 @@ class EventListener:
             None
 
         """
-        for e in self.events:
-            if e.name == event:
-                await e.callback(*args, **kwargs)
+        for handler in self.events.get(event, ()):
+            await handler.callback(*args, **kwargs)
 
-    async def listen(self) -> None:
-        """Listen for events."""
-        message = self.pubsub.get_message()
-        while message is not None:
-            if message["type"] == "pmessage":
-                logger.debug(f"Received message {message}")
-                data = message.get("data")
-                if data is None:
-                    return
-                data = data.decode("utf-8")
-                data = json.loads(data)
-                event = data.get("event")
-                if not event:
+    def parse_payload(self, payload: bytes | None) -> dict | None:
+        """
+        Parse a published payload into event data.
+
+        Args:
+        ----
+            payload (bytes | None): JSON encoded event.
+
+        Returns:
+        -------
+            dict | None: Event data or None if there is nothing to dispatch.
+
+        """
+        if payload is None:
+            return None
+        data = json.loads(payload.decode("utf-8"))
+        event = data.get("event")
+        if not event:
+            return None
+        if event not in self.events:
+            logger.debug(f"No handlers registered for event {event}")
+            return None
+        return data
+
+    async def handle_event(self, data: dict) -> None:
+        """
+        Attach the match to event data and dispatch it.
+
+        Args:
+        ----
+            data (dict): Event data.
+
+        Returns:
+        -------
+            None
+
+        """
+        event = data["event"]
+        logger.debug(f"Dispatching event {event}")
+        match_id = data.get("matchid")
+        if event in STATE_CHANGING_EVENTS:
+            match_cache.invalidate(match_id)
+        match: Match = await match_cache.fetch(match_id)
+        if not match:
+            return
+        await cluster.remember(match)
+        data["match"] = match
+        await self.dispatch(event, data)
+
+    def submit(self, data: dict, entry_id: bytes | None = None) -> None:
+        """
+        Queue event data behind earlier events of the same match.
+
+        A non-milestone event replaces the last queued event of the match when
+        it has the same type and has not started yet, so a burst of such
+        events is dispatched once with the newest data.
+
+        Args:
+        ----
+            data (dict): Event data.
+            entry_id (bytes | None): Stream entry to acknowledge once handled.
+
+        Returns:
+        -------
+            None
+
+        """
+        match_id = data.get("matchid")
+        if entry_id is not None:
+            self._entries.add(entry_id)
+        tail = self._tails.get(match_id)
+        if (
+            tail is not None
+            and not tail.started
+            and tail.data["event"] == data["event"]
+            and data["event"] not in MILESTONE_EVENTS
+        ):
+            tail.data = data
+            if entry_id is not None:
+                tail.entry_ids.append(entry_id)
+            self.coalesced += 1
+            return
+        queue = self._queues.get(match_id)
+        if queue is None:
+            queue = self._queues[match_id] = asyncio.Queue()
+            self._workers[match_id] = asyncio.create_task(self._worker(match_id, queue))
+        queued = QueuedEvent(data, deadline=time.monotonic())
+        if entry_id is not None:
+            queued.entry_ids.append(entry_id)
+        if self.coalesce_window and data["event"] not in MILESTONE_EVENTS:
+            queued.deadline += self.coalesce_window
+        self._tails[match_id] = queued
+        queue.put_nowait(queued)
+
+    async def _worker(self, match_id: int, queue: asyncio.Queue[QueuedEvent]) -> None:
+        while True:
+            try:
+                queued = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    del self._queues[match_id]
+                    del self._workers[match_id]
+                    self._tails.pop(match_id, None)
+                    logger.debug(f"Dropped idle event queue for match {match_id}")
                     return
-                logger.debug(f"Dispatching event {event}")
-                match: Match = await matches_retrieve.asyncio(
-                    client=api_client, id=data.get("matchid")
+                continue
+            if (delay := queued.deadline - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            queued.started = True
+            try:
+                async with self._semaphore:
+                    if await self._owns(match_id, queued):
+                        await self.handle_event(queued.data)
+            except ApiUnavailableError as e:
+                # The outage is not the fault of the event, so stream entries
+                # are retried without using up their attempts. Pub/sub events
+                # cannot be redelivered and are lost.
+                if not queued.entry_ids:
+                    logger.error(f"Dropped event of match {match_id}: {e}")
+                for entry_id in queued.entry_ids:
+                    logger.warning(f"Retrying entry {entry_id} later: {e}")
+                    self._entries.discard(entry_id)
+            except Exception as e:
+                logger.error(repr(e))
+                for entry_id in queued.entry_ids:
+                    await self._release_entry(entry_id)
+            else:
+                for entry_id in queued.entry_ids:
+                    await self._acknowledge(entry_id)
+
+    async def _owns(self, match_id: int, queued: QueuedEvent) -> bool:
+        # Instances running every shard share one consumer group, which hands
+        # each entry to one of them. Otherwise every instance receives every
+        # event and only the owner of the match guild handles it; the others
+        # acknowledge their copy.
+        if queued.entry_ids and cluster.shard_ids is None:
+            return True
+        return await cluster.owns_match(match_id)
+
+    async def _acknowledge(self, entry_id: bytes) -> None:
+        self._entries.discard(entry_id)
+        self._attempts.pop(entry_id, None)
+        try:
+            await self.redis.xack(self.stream, self.group, entry_id)
+        except (ConnectionError, TimeoutError) as e:
+            # Left pending, the entry is redelivered and handled again.
+            logger.error(f"Could not acknowledge entry {entry_id}: {e}")
+
+    async def _release_entry(self, entry_id: bytes) -> None:
+        attempts = self._attempts.get(entry_id, 0) + 1
+        if attempts >= settings.EVENTS_STREAM_MAX_DELIVERIES:
+            logger.error(f"Dropping entry {entry_id} after {attempts} failed attempts")
+            await self._acknowledge(entry_id)
+            return
+        # Stays pending so the next reclaim retries it.
+        self._attempts[entry_id] = attempts
+        self._entries.discard(entry_id)
+
+    def _submit_entries(self, entries: list[tuple[bytes, dict]]) -> None:
+        for entry_id, fields in entries:
+            if entry_id in self._entries:
+                continue
+            try:
+                # Reclaimed entries that were deleted from the stream have no
+                # fields and are only acknowledged.
+                data = self.parse_payload(fields.get(b"data")) if fields else None
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                logger.error(f"Malformed entry {entry_id}: {e!r}")
+                data = None
+            if data is None:
+                self._entries.add(entry_id)
+                task = asyncio.create_task(self._acknowledge(entry_id))
+                self._acks.add(task)
+                task.add_done_callback(self._acks.discard)
+                continue
+            self.submit(data, entry_id)
+
+    def stop(self) -> None:
+        """
+        Cancel all match workers and drop queued events.
+
+        Returns
+        -------
+            None
+
+        """
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+        self._tails.clear()
+        self._entries.clear()
+
+    async def _listen_pubsub(self) -> None:
+        async with self.redis.pubsub() as pubsub:
+            await pubsub.psubscribe(self.pattern)
+            logger.debug(f"Subscribed to {self.pattern}")
+            self._reconnect_delay = RECONNECT_MIN_DELAY
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                logger.debug(f"Received message {message}")
+                try:
+                    data = self.parse_payload(message.get("data"))
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    logger.error(repr(e))
+                    continue
+                # Ownership is checked by the match worker, so a slow lookup
+                # does not hold up the events of other matches.
+                if data is not None:
+                    self.submit(data)
+
+    async def _reclaim_pending(self) -> None:
+        start_id = "0-0"
+        while True:
+            response = await self.redis.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                min_idle_time=settings.EVENTS_STREAM_CLAIM_IDLE_MS,
+                start_id=start_id,
+                count=settings.EVENTS_STREAM_BATCH_SIZE,
+            )
+            start_id, entries = response[0], response[1]
+            if entries:
+                logger.debug(f"Reclaimed {len(entries)} pending entries")
+                self._submit_entries(entries)
+            if start_id in (b"0-0", "0-0"):
+                return
+
+    async def _listen_stream(self) -> None:
+        try:
+            # A new group starts at the end, so events of old matches already
+            # in the stream are not replayed.
+            await self.redis.xgroup_create(
+                self.stream, self.group, id="$", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        logger.debug(f"Consuming stream {self.stream} as {self.consumer}")
+        next_maintenance = 0.0
+        while True:
+            if time.monotonic() >= next_maintenance:
+                await self._reclaim_pending()
+                await self.redis.xtrim(
+                    self.stream,
+                    maxlen=settings.EVENTS_STREAM_MAXLEN,
+                    approximate=True,
                 )
-                if not match:
-                    return
-                data["match"] = match.to_dict()
-                await self.dispatch(event, data)
-            message = self.pubsub.get_message()
+                next_maintenance = (
+                    time.monotonic() + settings.EVENTS_STREAM_CLAIM_IDLE_MS / 1000
+                )
+            response = await self.redis.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.stream: ">"},
+                count=settings.EVENTS_STREAM_BATCH_SIZE,
+                block=settings.EVENTS_STREAM_BLOCK_MS,
+            )
+            self._reconnect_delay = RECONNECT_MIN_DELAY
+            for _stream, entries in response or ():
+                self._submit_entries(entries)
+
+    async def listen(self) -> None:
+        """
+        Listen for events.
+
+        Consumes the events stream with a consumer group when ``stream`` is
+        set, falling back to the ``event.*`` pubsub channels otherwise or if
+        the Redis server does not support streams. Events are handed to a
+        per-match queue, so events of one match stay ordered while different
+        matches are handled concurrently. Retries with exponential backoff
+        when the Redis connection drops or a command keeps failing.
+
+        Returns
+        -------
+            None
+
+        """
+        while True:
+            try:
+                if self.stream:
+                    await self._listen_stream()
+                else:
+                    await self._listen_pubsub()
+            except ResponseError as e:  # noqa: PERF203
+                if self.stream and "unknown command" in str(e).lower():
+                    logger.error(
+                        f"Streams are not supported: {e}. Falling back to pubsub"
+                    )
+                    self.stream = ""
+                    continue
+                await self._backoff(f"Redis command error: {e}")
+            except (ConnectionError, TimeoutError) as e:
+                await self._backoff(f"Redis connection error: {e}")
+            except Exception as e:
+                await self._backoff(f"Event listener error: {e!r}")
+
+    async def _backoff(self, reason: str) -> None:
+        delay = self._reconnect_delay
+        logger.error(f"{reason}. Retrying in {delay}s")
+        await asyncio.sleep(delay)
+        self._reconnect_delay = min(delay * 2, RECONNECT_MAX_DELAY)
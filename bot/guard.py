@@ -0,0 +1,105 @@
+"""Serialization and deduplication of component interactions."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING
+
+from bot.cache import TTLCache
+from bot.settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+
+class InteractionGuard:
+    """Run one interaction per resource at a time, and each action once."""
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        """
+        Interaction guard constructor.
+
+        Args:
+        ----
+            ttl (float): Seconds a successful action is remembered after it
+                started.
+            maxsize (int): Maximum number of actions remembered.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.deduplicated = 0
+        self._locks: weakref.WeakValueDictionary[Hashable, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._actions: TTLCache[Hashable, asyncio.Future[bool]] = TTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+
+    def lock(self, resource: Hashable) -> asyncio.Lock:
+        """
+        Get the lock of a resource, kept while anyone holds a reference to it.
+
+        Args:
+        ----
+            resource (Hashable): Resource key, e.g. a match id.
+
+        Returns:
+        -------
+            asyncio.Lock: Lock.
+
+        """
+        lock = self._locks.get(resource)
+        if lock is None:
+            lock = self._locks[resource] = asyncio.Lock()
+        return lock
+
+    async def run(
+        self,
+        resource: Hashable,
+        action: Hashable,
+        callback: Callable[[], Awaitable[bool]],
+    ) -> tuple[bool, bool]:
+        """
+        Run an action while holding the lock of its resource.
+
+        An action that succeeded recently or is still running is not run
+        again; the caller waits for its outcome instead. Failed actions are
+        forgotten, so repeating them runs them again.
+
+        Args:
+        ----
+            resource (Hashable): Resource key.
+            action (Hashable): Idempotency key of the action.
+            callback (Callable[[], Awaitable[bool]]): Runs the action and
+                returns whether it succeeded.
+
+        Returns:
+        -------
+            tuple[bool, bool]: Whether the action succeeded and whether this
+                call ran it.
+
+        """
+        while (future := self._actions.get(action)) is not None:
+            if await asyncio.shield(future):
+                self.deduplicated += 1
+                return True, False
+        future = asyncio.get_running_loop().create_future()
+        self._actions.set(action, future)
+        succeeded = False
+        try:
+            async with self.lock(resource):
+                succeeded = await callback()
+        finally:
+            if not succeeded and self._actions.peek(action) is future:
+                self._actions.pop(action)
+            future.set_result(succeeded)
+        return succeeded, True
+
+
+veto_guard = InteractionGuard(
+    ttl=settings.INTERACTION_DEDUP_TTL, maxsize=settings.MATCH_CACHE_SIZE
+)
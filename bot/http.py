@@ -0,0 +1,169 @@
+"""Instrumented HTTP connection pool for the API client."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from bot.logger import logger
+
+if TYPE_CHECKING:
+    from cs2_battle_bot_api_client import AuthenticatedClient
+
+# First trace events emitted once the pool handed a connection to a request.
+_ACQUIRED_EVENTS = frozenset(
+    {
+        "connection.connect_tcp.started",
+        "connection.connect_unix_socket.started",
+        "http11.send_request_headers.started",
+        "http2.send_request_headers.started",
+    }
+)
+
+
+def http2_available() -> bool:
+    """
+    Check whether the optional HTTP/2 dependency is installed.
+
+    Returns
+    -------
+        bool: Whether ``h2`` can be imported.
+
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PoolTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport that records connection pool statistics."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        """
+        Pool transport constructor.
+
+        Args:
+        ----
+            **kwargs: Arguments of ``httpx.AsyncHTTPTransport``.
+
+        Returns:
+        -------
+            None
+
+        """
+        super().__init__(**kwargs)
+        self.requests = 0
+        self.in_flight = 0
+        self.connects = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def stats(self) -> dict[str, float]:
+        """
+        Get pool utilisation and wait time statistics.
+
+        Returns
+        -------
+            dict[str, float]: Requests, in-flight requests, open, idle and
+                newly opened connections, and seconds spent waiting for a
+                connection.
+
+        """
+        connections = self._pool.connections
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "connections": len(connections),
+            "idle": sum(connection.is_idle() for connection in connections),
+            "connects": self.connects,
+            "wait_avg": self.wait_total / self.requests if self.requests else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Send a request, measuring how long it waited for a pooled connection.
+
+        Args:
+        ----
+            request (httpx.Request): Request object.
+
+        Returns:
+        -------
+            httpx.Response: Response object.
+
+        """
+        started = time.monotonic()
+        waited: list[float] = []
+        parent = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict) -> None:
+            if not waited and event in _ACQUIRED_EVENTS:
+                waited.append(time.monotonic() - started)
+            if event == "connection.connect_tcp.started":
+                self.connects += 1
+            if parent is not None:
+                await parent(event, info)
+
+        request.extensions["trace"] = trace
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+            wait = waited[0] if waited else time.monotonic() - started
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+
+async def warmup(client: AuthenticatedClient, connections: int) -> None:
+    """
+    Open pooled connections to the API before the first command needs them.
+
+    Args:
+    ----
+        client (AuthenticatedClient): API client.
+        connections (int): Number of connections to open concurrently.
+
+    Returns:
+    -------
+        None
+
+    Raises:
+    ------
+        httpx.HTTPError: If a connection could not be opened.
+
+    """
+    httpx_client = client.get_async_httpx_client()
+    results = await asyncio.gather(
+        *(httpx_client.head("/") for _ in range(connections)),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        raise errors[0]
+    logger.debug(f"Warmed up {connections} API connections")
+
+
+async def close(client: AuthenticatedClient, transport: PoolTransport) -> None:
+    """
+    Close the pooled connections of the API client.
+
+    Args:
+    ----
+        client (AuthenticatedClient): API client.
+        transport (PoolTransport): Transport of the client.
+
+    Returns:
+    -------
+        None
+
+    """
+    logger.debug(f"Closing API connection pool. Pool stats: {transport.stats()}")
+    await client.get_async_httpx_client().aclose()
@@ -1,19 +1,199 @@
 """Internationalization and localization support."""
 
+from __future__ import annotations
+
 import json
+import sys
+from functools import lru_cache
 from pathlib import Path
+from string import Formatter
+from typing import NamedTuple
 
-from pycord.i18n import I18n, _  # noqa: F401
+from pycord.i18n import I18n
 
 from bot.bot import bot
+from bot.settings import settings
+
+LOCALES_DIR = Path(__file__).parent / "locales"
+# Discord locales of locale files not named after one.
+LOCALE_ALIASES = {"en": "en-US"}
+DEFAULT_LOCALE = "en-US"
+
+
+class Template(NamedTuple):
+    """Translated string with its placeholders parsed once."""
+
+    text: str
+    fields: tuple[str, ...]
+
+
+def compile_template(text: str) -> Template:
+    """
+    Parse the placeholders of a translated string.
+
+    Args:
+    ----
+        text (str): Translated string.
+
+    Returns:
+    -------
+        Template: Compiled string.
+
+    """
+    return Template(
+        text=text,
+        fields=tuple(
+            field for _, field, _, _ in Formatter().parse(text) if field is not None
+        ),
+    )
+
+
+# Typed, so equal values of other types such as 1 and True are cached apart.
+@lru_cache(maxsize=settings.I18N_FORMAT_CACHE_SIZE, typed=True)
+def _format(text: str, *args: object) -> str:
+    return text.format(*args)
+
+
+class Catalog:
+    """Compiled translations with a fallback chain resolved per locale."""
+
+    def __init__(self, translations: dict[str, dict[str, str]], default: str) -> None:
+        """
+        Catalog constructor.
+
+        Args:
+        ----
+            translations (dict[str, dict[str, str]]): Strings keyed by locale.
+            default (str): Locale used for strings missing in other locales.
+
+        Returns:
+        -------
+            None
+
+        Raises:
+        ------
+            ValueError: If the locales do not have the same keys or a string
+                has other placeholders than in the default locale.
 
-locales = ["en", "pl"]
+        """
+        self.default = default
+        self.tables = {
+            locale: {
+                sys.intern(key): compile_template(text) for key, text in strings.items()
+            }
+            for locale, strings in translations.items()
+        }
+        self.validate()
+        self._resolved: dict[str | None, dict[str, Template]] = {}
 
-locales_data = {}
+    def validate(self) -> None:
+        """
+        Check that every locale translates the same keys and placeholders.
 
-for locale in locales:
-    with Path.open(Path("bot", "locales", f"{locale}.json")) as f:
-        locales_data[locale] = json.load(f)
+        Returns
+        -------
+            None
+
+        Raises
+        ------
+            ValueError: If a locale differs from the default locale.
+
+        """
+        reference = self.tables[self.default]
+        errors = []
+        for locale, table in self.tables.items():
+            if missing := reference.keys() - table.keys():
+                errors.append(f"{locale} is missing {sorted(missing)}")
+            if extra := table.keys() - reference.keys():
+                errors.append(f"{locale} has unknown {sorted(extra)}")
+            errors.extend(
+                f"{locale} {key} has placeholders {template.fields}, "
+                f"expected {reference[key].fields}"
+                for key, template in table.items()
+                if key in reference and template.fields != reference[key].fields
+            )
+        if errors:
+            msg = f"Invalid translations: {'; '.join(errors)}"
+            raise ValueError(msg)
+
+    def table(self, locale: str | None) -> dict[str, Template]:
+        """
+        Get the strings of a locale, falling back to its language and the default.
+
+        Args:
+        ----
+            locale (str | None): Discord locale, e.g. ``en-GB``.
+
+        Returns:
+        -------
+            dict[str, Template]: Compiled strings keyed by key.
+
+        """
+        if (table := self._resolved.get(locale)) is not None:
+            return table
+        chain = [self.default]
+        if locale:
+            chain += [locale.split("-")[0], locale]
+        table = {}
+        for fallback in chain:
+            table.update(self.tables.get(fallback, {}))
+        self._resolved[locale] = table
+        return table
+
+    def get_text(self, key: str, *args: object) -> str:
+        """
+        Translate a string to the locale of the current invocation.
+
+        Args:
+        ----
+            key (str): Translation key.
+            *args: Values of the placeholders.
+
+        Returns:
+        -------
+            str: Translated string, or the key if it is not translated.
+
+        """
+        template = self.table(getattr(I18n.instance, "current_locale", None)).get(key)
+        if template is None:
+            return key.format(*args) if args else key
+        if not args:
+            return template.text
+        try:
+            return _format(template.text, *args)
+        except TypeError:
+            # Unhashable arguments cannot be cached.
+            return template.text.format(*args)
+
+
+def load_locales() -> dict[str, dict]:
+    """
+    Load the locale files.
+
+    Returns
+    -------
+        dict[str, dict]: Locale file contents keyed by Discord locale.
+
+    """
+    locales_data = {}
+    for path in sorted(LOCALES_DIR.glob("*.json")):
+        with path.open(encoding="utf-8") as f:
+            locales_data[LOCALE_ALIASES.get(path.stem, path.stem)] = json.load(f)
+    return locales_data
+
+
+locales_data = load_locales()
+catalog = Catalog(
+    {locale: data.get("strings", {}) for locale, data in locales_data.items()},
+    default=DEFAULT_LOCALE,
+)
 i18n = I18n(
-    bot, consider_user_locale=True, en_US=locales_data["en"], pl=locales_data["pl"]
+    bot,
+    consider_user_locale=True,
+    **{
+        locale.replace("-", "_"): {"commands": data["commands"]}
+        for locale, data in locales_data.items()
+        if "commands" in data
+    },
 )
+_ = catalog.get_text
@@ -0,0 +1,263 @@
+"""Resolution and editing of match messages."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import discord
+from redis import ConnectionError, TimeoutError
+from redis.asyncio import Redis
+
+from bot.bot import bot
+from bot.cache import TTLCache
+from bot.logger import logger
+from bot.settings import redis_client, settings
+
+
+class MessageResolver:
+    """Resolve message ids to messages without relying on the message cache."""
+
+    def __init__(self, bot: discord.Bot, redis: Redis, maxsize: int) -> None:
+        """
+        Message resolver constructor.
+
+        Args:
+        ----
+            bot (discord.Bot): Bot instance.
+            redis (Redis): Async Redis client used to persist message channels.
+            maxsize (int): Maximum number of resolved messages kept in memory.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.bot = bot
+        self.redis = redis
+        self._messages: TTLCache[int, discord.PartialMessage] = TTLCache(
+            maxsize=maxsize, ttl=settings.MESSAGE_CHANNEL_TTL
+        )
+
+    @staticmethod
+    def _key(message_id: int) -> str:
+        return f"message:{message_id}:channel"
+
+    def _partial(self, channel_id: int, message_id: int) -> discord.PartialMessage:
+        channel = self.bot.get_channel(channel_id) or self.bot.get_partial_messageable(
+            channel_id
+        )
+        message = channel.get_partial_message(message_id)
+        self._messages.set(message_id, message)
+        return message
+
+    async def remember(self, message: discord.Message) -> None:
+        """
+        Persist the channel of a message so it can be resolved after a restart.
+
+        Args:
+        ----
+            message (discord.Message): Message object.
+
+        Returns:
+        -------
+            None
+
+        """
+        self._partial(message.channel.id, message.id)
+        try:
+            await self.redis.set(
+                self._key(message.id),
+                message.channel.id,
+                ex=settings.MESSAGE_CHANNEL_TTL,
+            )
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Could not persist channel of message {message.id}: {e}")
+
+    async def resolve(
+        self, message_id: int
+    ) -> discord.Message | discord.PartialMessage | None:
+        """
+        Resolve a message that can be replied to or edited.
+
+        Args:
+        ----
+            message_id (int): Message ID.
+
+        Returns:
+        -------
+            discord.Message | discord.PartialMessage | None: Message or None if
+                its channel is unknown.
+
+        """
+        if (message := self._messages.get(message_id)) is not None:
+            return message
+        if (message := self.bot.get_message(message_id)) is not None:
+            return message
+        try:
+            channel_id = await self.redis.get(self._key(message_id))
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Could not resolve channel of message {message_id}: {e}")
+            return None
+        if channel_id is None:
+            logger.error(f"Channel of message {message_id} is unknown")
+            return None
+        return self._partial(int(channel_id), message_id)
+
+
+class PendingEdit:
+    """Newest state waiting to be written to a message."""
+
+    __slots__ = ("message", "embed", "view", "future")
+
+    def __init__(self, message: discord.Message | discord.PartialMessage) -> None:
+        """
+        Pending edit constructor.
+
+        Args:
+        ----
+            message (discord.Message | discord.PartialMessage): Message to edit.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.message = message
+        self.embed: discord.Embed | None = None
+        self.view: discord.ui.View | None = None
+        self.future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+
+class EditScheduler:
+    """Coalesce edits of a message so only the newest state is sent."""
+
+    def __init__(self, interval: float, maxsize: int) -> None:
+        """
+        Edit scheduler constructor.
+
+        Args:
+        ----
+            interval (float): Minimum seconds between two edits of a message.
+            maxsize (int): Maximum number of messages whose last edit is tracked.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.interval = interval
+        self.sent = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self._pending: dict[int, PendingEdit] = {}
+        # Flushes waiting to send, referenced until they finish.
+        self._flushes: set[asyncio.Task] = set()
+        # Message id -> [time of the last edit, hash of the last embed sent].
+        self._last: TTLCache[int, list] = TTLCache(maxsize=maxsize, ttl=3600)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get scheduler statistics.
+
+        Returns
+        -------
+            dict[str, int]: Sent, coalesced, skipped and pending edits.
+
+        """
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "pending": len(self._pending),
+        }
+
+    def schedule(
+        self,
+        message: discord.Message | discord.PartialMessage,
+        *,
+        embed: discord.Embed | None = None,
+        view: discord.ui.View | None = None,
+    ) -> asyncio.Future[None]:
+        """
+        Schedule an edit of a message.
+
+        Replaces the embed or view of an edit that has not been sent yet.
+
+        Args:
+        ----
+            message (discord.Message | discord.PartialMessage): Message to edit.
+            embed (discord.Embed | None): New embed.
+            view (discord.ui.View | None): New view.
+
+        Returns:
+        -------
+            asyncio.Future[None]: Resolved once the state is written or skipped.
+
+        """
+        pending = self._pending.get(message.id)
+        if pending is None:
+            pending = self._pending[message.id] = PendingEdit(message)
+            task = asyncio.create_task(self._flush(message.id))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        else:
+            self.coalesced += 1
+        pending.message = message
+        if embed is not None:
+            pending.embed = embed
+        if view is not None:
+            pending.view = view
+        return pending.future
+
+    async def _flush(self, message_id: int) -> None:
+        pending = self._pending[message_id]
+        try:
+            await self._send(message_id)
+        except Exception as e:
+            logger.error(f"Could not edit message {message_id}: {e!r}")
+            pending.future.set_exception(e)
+            # Already logged; most callers do not await the edit.
+            pending.future.exception()
+        finally:
+            # Also reached on cancellation, so waiters never hang.
+            if self._pending.get(message_id) is pending:
+                del self._pending[message_id]
+            if not pending.future.done():
+                pending.future.set_result(None)
+
+    async def _send(self, message_id: int) -> None:
+        last = self._last.peek(message_id) or [0.0, None]
+        if (delay := last[0] + self.interval - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        pending = self._pending.pop(message_id)
+        kwargs = {}
+        embed_hash = last[1]
+        if pending.embed is not None:
+            embed_hash = hash(
+                json.dumps(pending.embed.to_dict(), sort_keys=True, default=str)
+            )
+            if embed_hash != last[1]:
+                kwargs["embed"] = pending.embed
+        if pending.view is not None:
+            kwargs["view"] = pending.view
+        if not kwargs:
+            self.skipped += 1
+            return
+        self._last.set(message_id, [time.monotonic(), last[1]])
+        try:
+            await pending.message.edit(**kwargs)
+        except discord.HTTPException as e:
+            logger.error(f"Could not edit message {message_id}: {e}")
+        else:
+            self.sent += 1
+            self._last.set(message_id, [time.monotonic(), embed_hash])
+
+
+message_resolver = MessageResolver(
+    bot, redis_client, maxsize=settings.MESSAGE_CACHE_SIZE
+)
+edit_scheduler = EditScheduler(
+    interval=settings.MESSAGE_EDIT_INTERVAL, maxsize=settings.MESSAGE_CACHE_SIZE
+)
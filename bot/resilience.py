@@ -0,0 +1,310 @@
+"""Retries, deadlines and circuit breakers around API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from enum import StrEnum
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from cs2_battle_bot_api_client.errors import UnexpectedStatus
+
+from bot.logger import logger
+from bot.settings import api_client, settings
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from cs2_battle_bot_api_client import AuthenticatedClient
+
+# Errors raised before the request reached the API, safe to retry for writes.
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ApiUnavailableError(Exception):
+    """The API did not answer in time or its circuit breaker is open."""
+
+
+class BreakerState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures of an endpoint."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Circuit breaker constructor.
+
+        Args:
+        ----
+            name (str): Endpoint name.
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a
+                trial call is let through.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial = False
+
+    def allow(self) -> None:
+        """
+        Check whether a call may be made.
+
+        Raises
+        ------
+            ApiUnavailableError: If the breaker is open.
+
+        """
+        if (
+            self.state == BreakerState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._set_state(BreakerState.HALF_OPEN)
+        if self.state == BreakerState.OPEN or (
+            self.state == BreakerState.HALF_OPEN and self._trial
+        ):
+            msg = f"Circuit breaker of {self.name} is open"
+            raise ApiUnavailableError(msg)
+        if self.state == BreakerState.HALF_OPEN:
+            self._trial = True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.failures = 0
+        self._trial = False
+        if self.state != BreakerState.CLOSED:
+            self._set_state(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker past the threshold."""
+        self.failures += 1
+        self._trial = False
+        if (
+            self.state == BreakerState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.opened += 1
+            self._opened_at = time.monotonic()
+            self._set_state(BreakerState.OPEN)
+
+    def release(self) -> None:
+        """Let another call be the trial after one ended without a result."""
+        self._trial = False
+
+    def _set_state(self, state: BreakerState) -> None:
+        logger.warning(f"Circuit breaker of {self.name}: {self.state} -> {state}")
+        self.state = state
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether an error is caused by the API being unavailable.
+
+    Args:
+    ----
+        error (Exception): Raised error.
+
+    Returns:
+    -------
+        bool: Whether the call may succeed when repeated.
+
+    """
+    if isinstance(error, UnexpectedStatus):
+        return (
+            error.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or error.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        )
+    return isinstance(error, httpx.TransportError)
+
+
+class ResilientApi:
+    """Call generated API endpoints with retries, a deadline and breakers."""
+
+    def __init__(
+        self,
+        client: AuthenticatedClient,
+        retries: int,
+        backoff: float,
+        backoff_max: float,
+        deadline: float,
+        failure_threshold: int,
+        reset_timeout: float,
+    ) -> None:
+        """
+        Resilient API constructor.
+
+        Args:
+        ----
+            client (AuthenticatedClient): API client.
+            retries (int): Retries after the first attempt.
+            backoff (float): Base seconds of the exponential backoff.
+            backoff_max (float): Maximum seconds between two attempts.
+            deadline (float): Maximum seconds a call may take, retries included.
+            failure_threshold (int): Consecutive failures that open a breaker.
+            reset_timeout (float): Seconds a breaker stays open.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.client = client
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker of an endpoint.
+
+        Args:
+        ----
+            name (str): Endpoint name.
+
+        Returns:
+        -------
+            CircuitBreaker: Circuit breaker.
+
+        """
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(
+                name, self.failure_threshold, self.reset_timeout
+            )
+        return breaker
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get circuit breaker states.
+
+        Returns
+        -------
+            dict[str, dict[str, Any]]: State, consecutive failures and number
+                of times opened, keyed by endpoint name.
+
+        """
+        return {
+            name: {
+                "state": str(breaker.state),
+                "failures": breaker.failures,
+                "opened": breaker.opened,
+            }
+            for name, breaker in self.breakers.items()
+        }
+
+    async def call(
+        self,
+        endpoint: ModuleType,
+        *,
+        detailed: bool = False,
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Call a generated API endpoint.
+
+        Idempotent calls are retried with jittered exponential backoff when the
+        API is unavailable. Other calls are only retried if the request was
+        never sent.
+
+        Args:
+        ----
+            endpoint (ModuleType): Endpoint module, e.g. ``matches_retrieve``.
+            detailed (bool): Return the ``Response`` instead of the parsed body.
+            idempotent (bool | None): Whether the call may be repeated.
+                Defaults to True for ``_retrieve`` and ``_list`` endpoints.
+            **kwargs: Endpoint arguments other than the client.
+
+        Returns:
+        -------
+            Any: Parsed body or ``Response``.
+
+        Raises:
+        ------
+            ApiUnavailableError: If the breaker is open, the deadline passed or
+                the API kept failing.
+            UnexpectedStatus: If the API rejected the request.
+
+        """
+        name = endpoint.__name__.rsplit(".", 1)[-1]
+        if idempotent is None:
+            idempotent = name.endswith(("_retrieve", "_list"))
+        function = endpoint.asyncio_detailed if detailed else endpoint.asyncio
+        breaker = self.breaker(name)
+        try:
+            async with asyncio.timeout(self.deadline):
+                return await self._attempt(
+                    function, breaker, idempotent=idempotent, kwargs=kwargs
+                )
+        except TimeoutError as e:
+            breaker.record_failure()
+            msg = f"{name} did not answer within {self.deadline}s"
+            raise ApiUnavailableError(msg) from e
+
+    async def _attempt(
+        self,
+        function: Any,
+        breaker: CircuitBreaker,
+        *,
+        idempotent: bool,
+        kwargs: dict[str, Any],
+    ) -> Any:
+        attempt = 0
+        while True:
+            breaker.allow()
+            try:
+                result = await function(client=self.client, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                retry = idempotent or isinstance(e, NOT_SENT_ERRORS)
+                if not retry or attempt >= self.retries:
+                    msg = f"{breaker.name} failed: {e!r}"
+                    raise ApiUnavailableError(msg) from e
+            except BaseException:
+                # A cancelled call neither failed nor succeeded, so it must
+                # not keep a half open breaker waiting for its result.
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return result
+            delay = random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))  # noqa: S311
+            attempt += 1
+            logger.debug(f"Retrying {breaker.name} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+resilient_api = ResilientApi(
+    api_client,
+    retries=settings.API_RETRIES,
+    backoff=settings.API_RETRY_BACKOFF,
+    backoff_max=settings.API_RETRY_BACKOFF_MAX,
+    deadline=settings.API_CALL_DEADLINE,
+    failure_threshold=settings.API_BREAKER_FAILURES,
+    reset_timeout=settings.API_BREAKER_RESET_TIMEOUT,
+)
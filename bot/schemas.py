@@ -232,52 +232,6 @@ class Match(BaseModel):
         """
         return [map_.tag for map_ in self.maps]
 
-    def create_match_embed(self) -> discord.Embed:
-        """
-        Create match embed.
-
-        Args:
-        ----
-            author_id (int): Author id.
-
-        Returns:
-        -------
-            discord.Embed: Embed with match information.
-
-        """
-        (
-            team1_mentioned_leader,
-            team2_mentioned_leader,
-        ) = self.get_mentioned_team_leaders()
-        (
-            team1_mentioned_players,
-            team2_mentioned_players,
-        ) = self.get_mentioned_team_players()
-        teams = [
-            (self.team1.name, team1_mentioned_leader, team1_mentioned_players),
-            (self.team2.name, team2_mentioned_leader, team2_mentioned_players),
-        ]
-        embed = discord.Embed(
-            title=_("embed_match_title"),
-            description=_("embed_match_desc", self.id, self.type),
-            color=discord.Colour.blurple(),
-        )
-
-        for team in teams:
-            team_name, team_leader, team_players = team
-            embed.add_field(
-                name=team_name,
-                value=", ".join(team_players),
-                inline=False,
-            )
-            embed.add_field(
-                name="Leader",
-                value=team_leader,
-                inline=False,
-            )
-        embed.set_footer(text=self.author_id)
-        return embed
-
     def get_config(self) -> dict:
         """
         Get match config.
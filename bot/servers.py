@@ -0,0 +1,196 @@
+"""In-memory index of the servers available to each guild."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from cs2_battle_bot_api_client.api.servers import servers_list
+from cs2_battle_bot_api_client.types import Unset
+
+from bot.cache import TTLCache, guild_cache
+from bot.logger import logger
+from bot.settings import settings
+from bot.singleflight import api_reads
+
+# Discord rejects autocomplete responses with more choices.
+MAX_CHOICES = 25
+
+
+class ServerEntry:
+    """Autocomplete choice of a server."""
+
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str, value: str) -> None:
+        """
+        Server entry constructor.
+
+        Args:
+        ----
+            name (str): Lowercase server name used for matching.
+            value (str): Choice value in the ``name:id`` format.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.name = name
+        self.value = value
+
+
+class GuildServers:
+    """Servers of a guild and the time they were listed."""
+
+    __slots__ = ("entries", "refreshed_at")
+
+    def __init__(self, entries: list[ServerEntry]) -> None:
+        """
+        Guild servers constructor.
+
+        Args:
+        ----
+            entries (list[ServerEntry]): Servers sorted by name.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.entries = entries
+        self.refreshed_at = time.monotonic()
+
+
+class ServerIndex:
+    """Per-guild server lists refreshed in the background."""
+
+    def __init__(
+        self, maxsize: int, refresh_interval: float, timeout: float, max_age: float
+    ) -> None:
+        """
+        Server index constructor.
+
+        Args:
+        ----
+            maxsize (int): Maximum number of guilds kept.
+            refresh_interval (float): Seconds after which a guild is listed
+                again in the background.
+            timeout (float): Seconds to wait for a guild that is not indexed yet.
+            max_age (float): Seconds a guild is kept without being searched.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self._guilds: TTLCache[str, GuildServers] = TTLCache(
+            maxsize=maxsize, ttl=max_age
+        )
+        self._refreshing: dict[str, asyncio.Task[GuildServers]] = {}
+
+    async def _list(self, guild_id: str) -> GuildServers:
+        guild = await guild_cache.fetch(guild_id)
+        entries = []
+        page = 1
+        while True:
+            paginated = await api_reads.call(
+                servers_list, guild_or_public=guild.id, page=page
+            )
+            entries.extend(
+                ServerEntry(server.name.lower(), f"{server.name}:{server.id}")
+                for server in paginated.results
+            )
+            if not paginated.next_ or isinstance(paginated.next_, Unset):
+                break
+            page += 1
+        entries.sort(key=lambda entry: entry.name)
+        servers = GuildServers(entries)
+        self._guilds.set(guild_id, servers)
+        logger.debug(f"Indexed {len(entries)} servers of guild {guild_id}")
+        return servers
+
+    def refresh(self, guild_id: str) -> asyncio.Task[GuildServers]:
+        """
+        List the servers of a guild again, sharing a refresh already running.
+
+        Args:
+        ----
+            guild_id (str): Discord guild ID.
+
+        Returns:
+        -------
+            asyncio.Task[GuildServers]: Refresh task.
+
+        """
+        task = self._refreshing.get(guild_id)
+        if task is None:
+            task = self._refreshing[guild_id] = asyncio.create_task(
+                self._list(guild_id)
+            )
+            task.add_done_callback(lambda _: self._refreshing.pop(guild_id, None))
+            task.add_done_callback(self._log_failure)
+        return task
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task[GuildServers]) -> None:
+        if not task.cancelled() and (error := task.exception()) is not None:
+            logger.error(f"Could not list servers: {error!r}")
+
+    async def _servers(self, guild_id: str) -> GuildServers | None:
+        servers = self._guilds.get(guild_id)
+        if servers is not None:
+            if time.monotonic() - servers.refreshed_at > self.refresh_interval:
+                self.refresh(guild_id)
+            return servers
+        task = self.refresh(guild_id)
+        done, _ = await asyncio.wait({task}, timeout=self.timeout)
+        if not done:
+            logger.warning(f"Servers of guild {guild_id} are not indexed yet")
+            return None
+        return None if task.exception() else task.result()
+
+    async def search(self, guild_id: str, query: str) -> list[str]:
+        """
+        Find servers whose name matches what the user typed.
+
+        Names starting with the query come first, then names with a word
+        starting with it, then names containing it.
+
+        Args:
+        ----
+            guild_id (str): Discord guild ID.
+            query (str): Text typed by the user.
+
+        Returns:
+        -------
+            list[str]: At most 25 choices in the ``name:id`` format.
+
+        """
+        servers = await self._servers(guild_id)
+        if servers is None:
+            return []
+        query = query.strip().lower()
+        if not query:
+            return [entry.value for entry in servers.entries[:MAX_CHOICES]]
+        ranked: list[list[str]] = [[], [], []]
+        for entry in servers.entries:
+            if entry.name.startswith(query):
+                ranked[0].append(entry.value)
+            elif f" {query}" in entry.name:
+                ranked[1].append(entry.value)
+            elif query in entry.name:
+                ranked[2].append(entry.value)
+            if len(ranked[0]) >= MAX_CHOICES:
+                break
+        return [value for rank in ranked for value in rank][:MAX_CHOICES]
+
+
+server_index = ServerIndex(
+    maxsize=settings.GUILD_CACHE_SIZE,
+    refresh_interval=settings.SERVER_INDEX_REFRESH_INTERVAL,
+    timeout=settings.SERVER_AUTOCOMPLETE_TIMEOUT,
+    max_age=settings.SERVER_INDEX_MAX_AGE,
+)
@@ -1,8 +1,13 @@
 """Bot settings."""
+
+from __future__ import annotations
+
 import httpx
 from cs2_battle_bot_api_client import AuthenticatedClient
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from redis.asyncio import Redis
 
+from bot.http import PoolTransport, http2_available
 from bot.logger import logger
 
 
@@ -20,6 +25,76 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    API_POOL_MAX_CONNECTIONS: int = 50
+    API_POOL_MAX_KEEPALIVE: int = 20
+    API_POOL_KEEPALIVE_EXPIRY: float = 60
+    API_POOL_WARMUP_CONNECTIONS: int = 2
+    API_CONNECT_TIMEOUT: float = 5
+    API_READ_TIMEOUT: float = 10
+    API_POOL_TIMEOUT: float = 5
+    API_HTTP2: bool = False
+    API_RETRIES: int = 2
+    API_RETRY_BACKOFF: float = 0.2
+    API_RETRY_BACKOFF_MAX: float = 2
+    API_CALL_DEADLINE: float = 8
+    API_BREAKER_FAILURES: int = 5
+    API_BREAKER_RESET_TIMEOUT: float = 30
+    STARTUP_IMPORT_BUDGET: float = 1.5
+    STARTUP_RETRIES: int = 5
+    STARTUP_RETRY_DELAY: float = 0.5
+    # Veto sequences overriding the defaults of BO1, BO3 or BO5, e.g.
+    # {"BO3": "ban ban pick side pick side ban ban"}. Other match types cannot
+    # be created and are ignored. The API enforces its own turn order, so a
+    # sequence must agree with it.
+    VETO_FORMATS: dict[str, str] = {}
+    INTERACTION_DEDUP_TTL: float = 10
+    MATCH_CACHE_SIZE: int = 256
+    MATCH_CACHE_TTL: float = 30
+    GUILD_CACHE_SIZE: int = 1024
+    GUILD_CACHE_TTL: float = 300
+    SINGLE_FLIGHT_ENDPOINTS: list[str] = [
+        "matches_retrieve",
+        "guilds_retrieve",
+        "servers_list",
+        "account_connect_link_retrieve",
+    ]
+    SERVER_INDEX_REFRESH_INTERVAL: float = 60
+    SERVER_INDEX_MAX_AGE: float = 60 * 60
+    SERVER_AUTOCOMPLETE_TIMEOUT: float = 2
+    EVENTS_MAX_CONCURRENCY: int = 10
+    EVENTS_QUEUE_IDLE_TIMEOUT: float = 300
+    EVENTS_COALESCE_WINDOW: float = 0.5
+    EVENTS_STREAM: str = ""
+    EVENTS_STREAM_GROUP: str = "cs2-battle-bot"
+    EVENTS_STREAM_CONSUMER: str = ""
+    EVENTS_STREAM_BATCH_SIZE: int = 50
+    EVENTS_STREAM_BLOCK_MS: int = 5000
+    EVENTS_STREAM_MAXLEN: int = 10000
+    EVENTS_STREAM_CLAIM_IDLE_MS: int = 60000
+    EVENTS_STREAM_MAX_DELIVERIES: int = 5
+    # Shards of this process. None lets Discord recommend the shard count
+    # and runs all shards; SHARD_IDS requires SHARD_COUNT. Several instances
+    # should each set SHARD_IDS, otherwise they all handle every interaction.
+    SHARD_COUNT: int | None = None
+    SHARD_IDS: list[int] | None = None
+    SHARD_METRICS_INTERVAL: float = 60
+    INSTANCE_ID: str = ""
+    CLUSTER_KEY: str = "cs2-battle-bot:instances"
+    CLUSTER_HEARTBEAT_INTERVAL: float = 5
+    CLUSTER_INSTANCE_TTL: float = 15
+    CLUSTER_RING_REPLICAS: int = 64
+    MATCH_GUILD_CACHE_SIZE: int = 4096
+    MATCH_GUILD_TTL: float = 60 * 60 * 24 * 7
+    VOICE_MOVE_CONCURRENCY: int = 5
+    VOICE_INDEX_MAX_ENTRIES: int = 100000
+    MESSAGE_CACHE_SIZE: int = 1024
+    MESSAGE_CHANNEL_TTL: int = 60 * 60 * 24 * 30
+    MESSAGE_EDIT_INTERVAL: float = 1.0
+    EMBED_CACHE_SIZE: int = 512
+    EMBED_CACHE_TTL: float = 600
+    I18N_FORMAT_CACHE_SIZE: int = 1024
+    MATCH_CONFIG_CACHE_TTL: float = 600
 
 
 settings = Settings()
@@ -60,10 +135,42 @@ async def log_response(response: httpx.Response) -> None:
     )
 
 
+if settings.API_HTTP2 and not http2_available():
+    logger.warning("API_HTTP2 is enabled but h2 is not installed, using HTTP/1.1")
+
+api_transport = PoolTransport(
+    limits=httpx.Limits(
+        max_connections=settings.API_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.API_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.API_POOL_KEEPALIVE_EXPIRY,
+    ),
+    http2=settings.API_HTTP2 and http2_available(),
+)
+
 api_client = AuthenticatedClient(
     base_url=settings.API_URL,
     token=settings.API_KEY,
     headers={"Content-Type": "application/json"},
     raise_on_unexpected_status=True,
-    httpx_args={"event_hooks": {"request": [log_request], "response": [log_response]}},
+    timeout=httpx.Timeout(
+        settings.API_READ_TIMEOUT,
+        connect=settings.API_CONNECT_TIMEOUT,
+        pool=settings.API_POOL_TIMEOUT,
+    ),
+    httpx_args={
+        "transport": api_transport,
+        # Hooks run on every request, so they are only installed when debugging.
+        "event_hooks": {"request": [log_request], "response": [log_response]}
+        if settings.DEBUG
+        else {},
+    },
+)
+
+redis_client = Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    socket_keepalive=True,
 )
@@ -0,0 +1,101 @@
+"""Gateway shard routing and health metrics."""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import discord
+
+
+def shard_for(guild_id: int, shard_count: int) -> int:
+    """
+    Get the shard Discord routes a guild to.
+
+    Args:
+    ----
+        guild_id (int): Discord guild id.
+        shard_count (int): Total number of shards.
+
+    Returns:
+    -------
+        int: Shard id.
+
+    """
+    return (guild_id >> 22) % shard_count
+
+
+class ShardMetrics:
+    """Latency, reconnects and event throughput of the shards of a bot."""
+
+    def __init__(self, bot: discord.AutoShardedBot) -> None:
+        """
+        Shard metrics constructor.
+
+        Args:
+        ----
+            bot (discord.AutoShardedBot): Bot whose shards are measured.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.bot = bot
+        self.connects: Counter[int] = Counter()
+        self.disconnects: Counter[int] = Counter()
+        self.resumes: Counter[int] = Counter()
+        self.events: Counter[int] = Counter()
+        self.throughput: dict[int, float] = {}
+        self._sequences: dict[int, tuple[int, float]] = {}
+
+    def sample(self) -> None:
+        """
+        Update the event throughput of every shard.
+
+        The gateway numbers the events of a session, so the throughput is the
+        growth of the sequence number since the previous sample. A smaller
+        number means a new session, counted from zero.
+
+        Returns
+        -------
+            None
+
+        """
+        now = time.monotonic()
+        for shard_id, shard in self.bot.shards.items():
+            # ShardInfo has no public access to the sequence of its websocket.
+            ws = getattr(shard._parent, "ws", None)  # noqa: SLF001
+            sequence = (ws.sequence if ws is not None else None) or 0
+            previous, sampled = self._sequences.get(shard_id, (sequence, now))
+            received = sequence - previous if sequence >= previous else sequence
+            self.events[shard_id] += received
+            if now > sampled:
+                self.throughput[shard_id] = received / (now - sampled)
+            self._sequences[shard_id] = (sequence, now)
+
+    def stats(self) -> dict[int, dict[str, Any]]:
+        """
+        Get per shard statistics.
+
+        Returns
+        -------
+            dict[int, dict[str, Any]]: Latency in seconds, connection state,
+                connects, disconnects, resumes, events received and events per
+                second at the last sample, keyed by shard id.
+
+        """
+        return {
+            shard_id: {
+                "latency": shard.latency,
+                "closed": shard.is_closed(),
+                "connects": self.connects[shard_id],
+                "disconnects": self.disconnects[shard_id],
+                "resumes": self.resumes[shard_id],
+                "events": self.events[shard_id],
+                "events_per_second": round(self.throughput.get(shard_id, 0), 2),
+            }
+            for shard_id, shard in self.bot.shards.items()
+        }
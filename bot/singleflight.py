@@ -0,0 +1,144 @@
+"""Coalescing of identical concurrent API reads."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from bot.resilience import ResilientApi, resilient_api
+from bot.settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+    from types import ModuleType
+
+
+def endpoint_name(endpoint: ModuleType) -> str:
+    """
+    Get the name of a generated API endpoint module.
+
+    Args:
+    ----
+        endpoint (ModuleType): Endpoint module, e.g. ``matches_retrieve``.
+
+    Returns:
+    -------
+        str: Endpoint name.
+
+    """
+    return endpoint.__name__.rsplit(".", 1)[-1]
+
+
+class SingleFlight:
+    """Share one in-flight request between concurrent identical API reads."""
+
+    def __init__(self, api: ResilientApi, endpoints: Iterable[str]) -> None:
+        """
+        Single flight constructor.
+
+        Args:
+        ----
+            api (ResilientApi): API caller used for every endpoint.
+            endpoints (Iterable[str]): Names of the endpoints whose calls are
+                coalesced. Other endpoints are called directly.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.api = api
+        self.endpoints = frozenset(endpoints)
+        self.calls: Counter[str] = Counter()
+        self.deduplicated: Counter[str] = Counter()
+        self._flights: dict[Hashable, asyncio.Future[Any]] = {}
+
+    @staticmethod
+    def _key(name: str, kwargs: dict[str, Any]) -> Hashable:
+        return name, tuple(sorted(kwargs.items()))
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Get per endpoint statistics.
+
+        Returns
+        -------
+            dict[str, dict[str, int]]: Backend calls and deduplicated calls
+                keyed by endpoint name.
+
+        """
+        return {
+            name: {"calls": self.calls[name], "deduplicated": self.deduplicated[name]}
+            for name in self.calls | self.deduplicated
+        }
+
+    def forget(self, endpoint: ModuleType, **kwargs: Any) -> None:
+        """
+        Detach a running call so later identical calls reach the backend again.
+
+        Args:
+        ----
+            endpoint (ModuleType): Endpoint module.
+            **kwargs: Endpoint arguments other than the client.
+
+        Returns:
+        -------
+            None
+
+        """
+        self._flights.pop(self._key(endpoint_name(endpoint), kwargs), None)
+
+    async def run(self, endpoint: ModuleType, **kwargs: Any) -> tuple[Any, bool]:
+        """
+        Call an endpoint, joining an identical call that is still running.
+
+        Args:
+        ----
+            endpoint (ModuleType): Endpoint module.
+            **kwargs: Endpoint arguments other than the client.
+
+        Returns:
+        -------
+            tuple[Any, bool]: Parsed response and whether this caller issued
+                the request and it was not detached while running.
+
+        """
+        name = endpoint_name(endpoint)
+        if name not in self.endpoints:
+            self.calls[name] += 1
+            return await self.api.call(endpoint, **kwargs), True
+        key = self._key(name, kwargs)
+        if (flight := self._flights.get(key)) is not None:
+            self.deduplicated[name] += 1
+            return await asyncio.shield(flight), False
+        self.calls[name] += 1
+        flight = asyncio.ensure_future(self.api.call(endpoint, **kwargs))
+        self._flights[key] = flight
+        try:
+            result = await asyncio.shield(flight)
+        finally:
+            current = self._flights.get(key) is flight
+            if current:
+                del self._flights[key]
+        return result, current
+
+    async def call(self, endpoint: ModuleType, **kwargs: Any) -> Any:
+        """
+        Call an endpoint, joining an identical call that is still running.
+
+        Args:
+        ----
+            endpoint (ModuleType): Endpoint module.
+            **kwargs: Endpoint arguments other than the client.
+
+        Returns:
+        -------
+            Any: Parsed response.
+
+        """
+        result, _ = await self.run(endpoint, **kwargs)
+        return result
+
+
+api_reads = SingleFlight(resilient_api, endpoints=settings.SINGLE_FLIGHT_ENDPOINTS)
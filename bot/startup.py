@@ -0,0 +1,168 @@
+"""Startup pipeline timing and dependency retries."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, TypeVar
+
+from bot.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+T = TypeVar("T")
+
+
+class StartupReport:
+    """Durations of the startup phases."""
+
+    def __init__(self) -> None:
+        """
+        Startup report constructor.
+
+        Returns
+        -------
+            None
+
+        """
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.reported = False
+        self._running: dict[str, float] = {}
+
+    def begin(self, name: str) -> None:
+        """
+        Start timing a phase.
+
+        Args:
+        ----
+            name (str): Phase name.
+
+        Returns:
+        -------
+            None
+
+        """
+        self._running[name] = time.perf_counter()
+
+    def end(self, name: str, budget: float | None = None) -> float:
+        """
+        Stop timing a phase.
+
+        Args:
+        ----
+            name (str): Phase name.
+            budget (float | None): Seconds the phase should take at most.
+                A warning is logged when it took longer.
+
+        Returns:
+        -------
+            float: Seconds the phase took, 0 if it was not started.
+
+        """
+        started = self._running.pop(name, None)
+        if started is None:
+            return 0
+        duration = self.phases[name] = time.perf_counter() - started
+        if budget is not None:
+            self.check_budget(name, budget)
+        return duration
+
+    def check_budget(self, name: str, budget: float) -> bool:
+        """
+        Warn when a finished phase took longer than its budget.
+
+        Args:
+        ----
+            name (str): Phase name.
+            budget (float): Seconds the phase should take at most.
+
+        Returns:
+        -------
+            bool: Whether the phase finished within its budget.
+
+        """
+        duration = self.phases.get(name, 0)
+        if duration <= budget:
+            return True
+        logger.warning(
+            f"Startup phase {name} took {duration:.3f}s, over its {budget}s budget"
+        )
+        return False
+
+    @contextmanager
+    def phase(self, name: str, budget: float | None = None) -> Iterator[None]:
+        """
+        Time a phase.
+
+        Args:
+        ----
+            name (str): Phase name.
+            budget (float | None): Seconds the phase should take at most.
+
+        Returns:
+        -------
+            Iterator[None]: Context manager.
+
+        """
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name, budget)
+
+    def report(self) -> None:
+        """Log the phase durations once."""
+        if self.reported:
+            return
+        self.reported = True
+        phases = " | ".join(
+            f"{name} {duration:.3f}s" for name, duration in self.phases.items()
+        )
+        logger.info(f"Started in {time.perf_counter() - self.started:.3f}s: {phases}")
+
+
+async def retry(
+    name: str,
+    callback: Callable[[], Awaitable[T]],
+    attempts: int,
+    delay: float,
+) -> T:
+    """
+    Call a dependency until it answers, doubling the delay between attempts.
+
+    Args:
+    ----
+        name (str): Dependency name.
+        callback (Callable[[], Awaitable[T]]): Connectivity check.
+        attempts (int): Maximum number of attempts.
+        delay (float): Seconds before the second attempt.
+
+    Returns:
+    -------
+        T: Result of the first successful attempt.
+
+    Raises:
+    ------
+        Exception: The error of the last attempt.
+
+    """
+    attempt = 1
+    while True:
+        try:
+            return await callback()
+        except Exception as e:
+            if attempt >= attempts:
+                raise
+            logger.warning(
+                f"{name} unavailable ({e!r}), attempt {attempt}/{attempts}. "
+                f"Retrying in {delay}s"
+            )
+        await asyncio.sleep(delay)
+        delay *= 2
+        attempt += 1
+
+
+startup = StartupReport()
@@ -0,0 +1,268 @@
+"""Map veto formats and state machine."""
+
+from __future__ import annotations
+
+import copy
+from enum import StrEnum
+from typing import TYPE_CHECKING, NamedTuple
+
+from cs2_battle_bot_api_client.models import MatchTypeEnum
+
+from bot.logger import logger
+from bot.settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from cs2_battle_bot_api_client.models import Match
+
+# Veto sequences of the match types, one space separated step per action.
+# Once a sequence is used up, maps are banned until only the maps to be played
+# are left, so the sequences fit map pools of any size.
+DEFAULT_FORMATS = {
+    "BO1": "ban ban ban ban ban ban",
+    "BO3": "ban ban pick pick ban ban",
+    "BO5": "ban ban pick pick pick pick",
+}
+
+
+class VetoStep(StrEnum):
+    """What happens next in a veto."""
+
+    BAN = "ban"
+    PICK = "pick"
+    SIDE = "side"
+    LAUNCH = "launch"
+
+
+class UnknownFormatError(ValueError):
+    """The match type has no veto format."""
+
+
+class VetoFormat(NamedTuple):
+    """Compiled veto sequence of a match type."""
+
+    name: str
+    # Step to take after n bans and picks.
+    table: tuple[VetoStep, ...]
+    num_maps: int
+
+    def step(self, actions: int) -> VetoStep:
+        """
+        Get the step following a number of bans and picks.
+
+        Args:
+        ----
+            actions (int): Bans and picks made so far.
+
+        Returns:
+        -------
+            VetoStep: Next step, a ban once the sequence is used up.
+
+        """
+        return self.table[actions] if actions < len(self.table) else VetoStep.BAN
+
+
+def compile_format(name: str, sequence: str) -> VetoFormat:
+    """
+    Compile a veto sequence into a step table.
+
+    Side steps are accepted but not part of the table, because sides are
+    chosen when the match is created.
+
+    Args:
+    ----
+        name (str): Match type.
+        sequence (str): Space separated ``ban``, ``pick`` and ``side`` steps.
+
+    Returns:
+    -------
+        VetoFormat: Compiled format.
+
+    Raises:
+    ------
+        ValueError: If the sequence contains an unknown step.
+
+    """
+    steps = [VetoStep(step) for step in sequence.lower().split()]
+    if VetoStep.LAUNCH in steps:
+        msg = f"Veto format {name} must not contain a launch step"
+        raise ValueError(msg)
+    table = tuple(step for step in steps if step != VetoStep.SIDE)
+    return VetoFormat(name=name, table=table, num_maps=table.count(VetoStep.PICK) + 1)
+
+
+def compile_formats(overrides: dict[str, str]) -> dict[str, VetoFormat]:
+    """
+    Compile the default veto sequences and their overrides.
+
+    Only match types known to the API can be overridden; other entries are
+    ignored, since matches cannot be created with them.
+
+    Args:
+    ----
+        overrides (dict[str, str]): Sequences keyed by match type.
+
+    Returns:
+    -------
+        dict[str, VetoFormat]: Compiled formats keyed by match type.
+
+    """
+    match_types = {str(match_type) for match_type in MatchTypeEnum}
+    for name in overrides.keys() - match_types:
+        logger.warning(f"Ignoring veto format of unknown match type {name}")
+    return {
+        name: compile_format(name, sequence)
+        for name, sequence in {**DEFAULT_FORMATS, **overrides}.items()
+        if name in match_types
+    }
+
+
+FORMATS = compile_formats(settings.VETO_FORMATS)
+
+
+class VetoState(NamedTuple):
+    """Progress of a map veto."""
+
+    format: VetoFormat
+    maps_left: tuple[str, ...]
+    picks: tuple[str, ...] = ()
+    bans: int = 0
+
+    @classmethod
+    def from_match(cls, match: Match) -> VetoState:
+        """
+        Get the veto state of a match.
+
+        Args:
+        ----
+            match (Match): Match object.
+
+        Returns:
+        -------
+            VetoState: Veto state.
+
+        Raises:
+        ------
+            UnknownFormatError: If the match type has no veto format.
+
+        """
+        veto_format = FORMATS.get(str(match.type))
+        if veto_format is None:
+            msg = f"Match {match.id} has no veto format for type {match.type}"
+            raise UnknownFormatError(msg)
+        picks = tuple(pick.map_.tag for pick in match.map_picks)
+        taken = {ban.map_.tag for ban in match.map_bans}.union(picks)
+        return cls(
+            format=veto_format,
+            maps_left=tuple(map_.tag for map_ in match.maps if map_.tag not in taken),
+            picks=picks,
+            bans=len(match.map_bans),
+        )
+
+    @property
+    def actions(self) -> int:
+        """Number of bans and picks made."""
+        return self.bans + len(self.picks)
+
+    @property
+    def step(self) -> VetoStep:
+        """Next step of the veto, launch once only the maps to play are left."""
+        if len(self.maps_left) <= max(self.format.num_maps - len(self.picks), 1):
+            return VetoStep.LAUNCH
+        return self.format.step(self.actions)
+
+    @property
+    def maplist(self) -> list[str]:
+        """Maps to be played, in order, once known."""
+        if self.step != VetoStep.LAUNCH:
+            return list(self.picks)
+        return [*self.picks, *self.maps_left][: self.format.num_maps]
+
+    def same_veto(self, other: VetoState) -> bool:
+        """
+        Check whether two states show the same veto.
+
+        The maps left are compared regardless of order, since the API and the
+        match list them in different orders.
+
+        Args:
+        ----
+            other (VetoState): State to compare with.
+
+        Returns:
+        -------
+            bool: Whether bans, picks, maps left and map list agree.
+
+        """
+        return (
+            self.bans == other.bans
+            and self.picks == other.picks
+            and set(self.maps_left) == set(other.maps_left)
+            and self.maplist == other.maplist
+        )
+
+    def _without(
+        self, map_tag: str, maps_left: Sequence[str] | None
+    ) -> tuple[str, ...]:
+        if maps_left is not None:
+            return tuple(maps_left)
+        return tuple(tag for tag in self.maps_left if tag != map_tag)
+
+    def ban(self, map_tag: str, maps_left: Sequence[str] | None = None) -> VetoState:
+        """
+        Ban a map.
+
+        Args:
+        ----
+            map_tag (str): Banned map.
+            maps_left (Sequence[str] | None): Maps left according to the API,
+                preferred over the local computation when given.
+
+        Returns:
+        -------
+            VetoState: State after the ban.
+
+        """
+        return self._replace(
+            maps_left=self._without(map_tag, maps_left), bans=self.bans + 1
+        )
+
+    def pick(self, map_tag: str, maps_left: Sequence[str] | None = None) -> VetoState:
+        """
+        Pick a map.
+
+        Args:
+        ----
+            map_tag (str): Picked map.
+            maps_left (Sequence[str] | None): Maps left according to the API,
+                preferred over the local computation when given.
+
+        Returns:
+        -------
+            VetoState: State after the pick.
+
+        """
+        return self._replace(
+            maps_left=self._without(map_tag, maps_left),
+            picks=(*self.picks, map_tag),
+        )
+
+    def apply(self, match: Match) -> Match:
+        """
+        Get a copy of a match showing this veto state.
+
+        Only the map list is updated; bans and picks stay as last retrieved.
+
+        Args:
+        ----
+            match (Match): Match object.
+
+        Returns:
+        -------
+            Match: Match copy.
+
+        """
+        match = copy.copy(match)
+        match.maplist = self.maplist
+        return match
@@ -0,0 +1,271 @@
+"""Voice channel helpers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+import discord
+
+from bot.logger import logger
+from bot.settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+class MoveResult(NamedTuple):
+    """Summary of a bulk voice move."""
+
+    moved: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class GuildVoiceStates:
+    """Voice channel of every connected member of a guild."""
+
+    __slots__ = ("channels", "moves")
+
+    def __init__(self) -> None:
+        """Guild voice states constructor."""
+        self.channels: dict[int, int] = {}
+        # Moving a member edits it through the guild members route, which
+        # Discord rate limits per guild, so concurrency is bounded per guild.
+        # Dropped with the guild, like its states.
+        self.moves = asyncio.Semaphore(settings.VOICE_MOVE_CONCURRENCY)
+
+
+class VoiceStateIndex:
+    """Index of user id to current voice channel id, per guild."""
+
+    def __init__(self, max_entries: int) -> None:
+        """
+        Voice state index constructor.
+
+        Args:
+        ----
+            max_entries (int): Maximum number of members tracked across all
+                guilds. Least recently active guilds are dropped first and are
+                indexed again on their next lookup.
+
+        Returns:
+        -------
+            None
+
+        """
+        self.max_entries = max_entries
+        self._guilds: OrderedDict[int, GuildVoiceStates] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of tracked members."""
+        return self._size
+
+    def _index_guild(self, guild: discord.Guild) -> GuildVoiceStates:
+        states = GuildVoiceStates()
+        if (previous := self._guilds.get(guild.id)) is not None:
+            states.moves = previous.moves
+        for channel in guild.voice_channels + guild.stage_channels:
+            for user_id in channel.voice_states:
+                states.channels[user_id] = channel.id
+        self.remove_guild(guild.id)
+        self._guilds[guild.id] = states
+        self._size += len(states.channels)
+        self._evict(keep=guild.id)
+        return states
+
+    def _evict(self, keep: int) -> None:
+        while self._size > self.max_entries and len(self._guilds) > 1:
+            guild_id = next(iter(self._guilds))
+            if guild_id == keep:
+                self._guilds.move_to_end(guild_id)
+                continue
+            self.remove_guild(guild_id)
+
+    def _states(self, guild: discord.Guild) -> GuildVoiceStates:
+        states = self._guilds.get(guild.id)
+        if states is None:
+            return self._index_guild(guild)
+        self._guilds.move_to_end(guild.id)
+        return states
+
+    def update(self, guild_id: int, user_id: int, channel_id: int | None) -> None:
+        """
+        Record the voice channel a member is connected to.
+
+        Updates for guilds that are not indexed yet are ignored, because the
+        guild is indexed from the gateway cache on its first lookup.
+
+        Args:
+        ----
+            guild_id (int): Guild ID.
+            user_id (int): User ID.
+            channel_id (int | None): Voice channel ID or None after disconnecting.
+
+        Returns:
+        -------
+            None
+
+        """
+        states = self._guilds.get(guild_id)
+        if states is None:
+            return
+        self._guilds.move_to_end(guild_id)
+        if channel_id is None:
+            if states.channels.pop(user_id, None) is not None:
+                self._size -= 1
+            return
+        if user_id not in states.channels:
+            self._size += 1
+        states.channels[user_id] = channel_id
+        self._evict(keep=guild_id)
+
+    def remove_guild(self, guild_id: int) -> None:
+        """
+        Stop tracking a guild.
+
+        Args:
+        ----
+            guild_id (int): Guild ID.
+
+        Returns:
+        -------
+            None
+
+        """
+        states = self._guilds.pop(guild_id, None)
+        if states is not None:
+            self._size -= len(states.channels)
+
+    def channel_of(self, guild: discord.Guild, user_id: int) -> int | None:
+        """
+        Get the voice channel a member is connected to.
+
+        Args:
+        ----
+            guild (discord.Guild): Guild.
+            user_id (int): User ID.
+
+        Returns:
+        -------
+            int | None: Voice channel ID or None if the member is not in voice.
+
+        """
+        return self._states(guild).channels.get(user_id)
+
+    def locate(self, guild: discord.Guild, user_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Find which of the given users are in voice, and where.
+
+        Args:
+        ----
+            guild (discord.Guild): Guild.
+            user_ids (Iterable[int]): User IDs.
+
+        Returns:
+        -------
+            dict[int, int]: Voice channel ID of every user that is in voice.
+
+        """
+        channels = self._states(guild).channels
+        return {
+            user_id: channels[user_id] for user_id in user_ids if user_id in channels
+        }
+
+    def move_semaphore(self, guild: discord.Guild) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding concurrent member moves in a guild.
+
+        Args:
+        ----
+            guild (discord.Guild): Guild.
+
+        Returns:
+        -------
+            asyncio.Semaphore: Semaphore of the guild.
+
+        """
+        return self._states(guild).moves
+
+    def channel_members(self, guild: discord.Guild, channel_id: int) -> list[int]:
+        """
+        Get the users connected to a voice channel.
+
+        Args:
+        ----
+            guild (discord.Guild): Guild.
+            channel_id (int): Voice channel ID.
+
+        Returns:
+        -------
+            list[int]: User IDs.
+
+        """
+        return [
+            user_id
+            for user_id, current in self._states(guild).channels.items()
+            if current == channel_id
+        ]
+
+
+voice_index = VoiceStateIndex(max_entries=settings.VOICE_INDEX_MAX_ENTRIES)
+
+
+async def _move_member(
+    member: discord.Member,
+    channel: discord.VoiceChannel,
+    semaphore: asyncio.Semaphore,
+) -> bool:
+    async with semaphore:
+        try:
+            await member.move_to(channel)
+        except discord.HTTPException as e:
+            logger.error(f"Could not move {member} to {channel} channel: {e}")
+            return False
+    logger.debug(f"Moved {member} to {channel} channel")
+    return True
+
+
+async def move_members(
+    guild: discord.Guild, targets: Mapping[int, discord.VoiceChannel | None]
+) -> MoveResult:
+    """
+    Move members to voice channels concurrently.
+
+    Members that are not connected to voice, already in their target channel
+    or without a target channel, e.g. a deleted one, are skipped.
+
+    Args:
+    ----
+        guild (discord.Guild): Guild.
+        targets (Mapping[int, discord.VoiceChannel | None]): Target channel
+            keyed by user ID.
+
+    Returns:
+    -------
+        MoveResult: Number of moved, skipped and failed members.
+
+    """
+    located = voice_index.locate(guild, targets)
+    to_move = {
+        user_id
+        for user_id, channel_id in located.items()
+        if targets[user_id] is not None and channel_id != targets[user_id].id
+    }
+    semaphore = voice_index.move_semaphore(guild)
+    pending = []
+    for user_id in to_move:
+        member = guild.get_member(user_id)
+        if member is not None:
+            pending.append(_move_member(member, targets[user_id], semaphore))
+    results = await asyncio.gather(*pending)
+    moved = sum(results)
+    result = MoveResult(
+        moved=moved,
+        skipped=len(targets) - len(pending),
+        failed=len(results) - moved,
+    )
+    logger.debug(f"Voice move result: {result}")
+    return result
@@ -0,0 +1,13 @@
+"""Shared test fixtures."""
+
+import time
+
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze ``time.monotonic``; advance it by adding to ``clock[0]``."""
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
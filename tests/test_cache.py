@@ -0,0 +1,60 @@
+"""Tests of the API object caches."""
+
+from types import SimpleNamespace
+
+from bot.cache import MatchCache, TTLCache
+
+
+def test_entries_expire_after_ttl(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=5)
+    ttl_cache.set("a", 1)
+    clock[0] += 5
+    assert ttl_cache.get("a") == 1
+    clock[0] += 0.1
+    assert ttl_cache.get("a") is None
+    assert len(ttl_cache) == 0
+    assert (ttl_cache.hits, ttl_cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=5)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+    assert ttl_cache.peek("b") is None
+    assert ttl_cache.peek("a") == 1
+    assert ttl_cache.peek("c") == 3
+
+
+def test_peek_does_not_count_or_expire(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=5)
+    ttl_cache.set("a", 1)
+    clock[0] += 10
+    assert ttl_cache.peek("a") == 1
+    assert (ttl_cache.hits, ttl_cache.misses) == (0, 0)
+    assert ttl_cache.pop("a") == 1
+    assert ttl_cache.pop("a") is None
+
+
+def match(updated_at, match_id=1):
+    return SimpleNamespace(id=match_id, updated_at=updated_at)
+
+
+def test_put_keeps_newer_snapshot(clock):
+    match_cache = MatchCache(maxsize=10, ttl=5)
+    newer = match("2024-01-02T00:00:00")
+    match_cache.put(newer)
+    match_cache.put(match("2024-01-01T00:00:00"))
+    assert match_cache.get(1) is newer
+
+
+def test_put_replaces_older_or_equal_snapshot(clock):
+    match_cache = MatchCache(maxsize=10, ttl=5)
+    match_cache.put(match("2024-01-01T00:00:00"))
+    equal = match("2024-01-01T00:00:00")
+    match_cache.put(equal)
+    assert match_cache.get(1) is equal
+    newer = match("2024-01-02T00:00:00")
+    match_cache.put(newer)
+    assert match_cache.get(1) is newer
@@ -0,0 +1,112 @@
+"""Tests of guild ownership between instances."""
+
+import asyncio
+
+from bot.cluster import Cluster, HashRing
+from bot.shards import shard_for
+
+GUILDS = [str(guild_id) for guild_id in range(1000)]
+
+
+def test_ring_owns_every_key_with_a_node():
+    ring = HashRing(["a", "b", "c"], replicas=64)
+    owners = {ring.owner(guild_id) for guild_id in GUILDS}
+    assert owners == {"a", "b", "c"}
+    assert HashRing(["c", "b", "a"], replicas=64).owner("42") == ring.owner("42")
+
+
+def test_empty_ring_owns_nothing():
+    assert HashRing([], replicas=64).owner("42") is None
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    before = HashRing(["a", "b", "c"], replicas=64)
+    after = HashRing(["a", "b", "c", "d"], replicas=64)
+    moved = [g for g in GUILDS if before.owner(g) != after.owner(g)]
+    assert moved
+    assert all(after.owner(guild_id) == "d" for guild_id in moved)
+    assert len(moved) < len(GUILDS) / 2
+
+
+class FakePipeline:
+    def __init__(self, members):
+        self.members = members
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zadd(self, key, mapping):
+        self.members.update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        pass
+
+    def zrange(self, key, start, end):
+        pass
+
+    async def execute(self):
+        return [1, 0, [member.encode() for member in self.members]]
+
+
+class FakeRedis:
+    def __init__(self, *members):
+        self.members = dict.fromkeys(members, 0)
+        self.values = {}
+
+    def pipeline(self, transaction):
+        return FakePipeline(self.members)
+
+    async def get(self, key):
+        return self.values.get(key.encode())
+
+    async def zrem(self, key, member):
+        self.members.pop(member, None)
+
+
+def make_cluster(redis, instance_id, **kwargs):
+    return Cluster(
+        redis, instance_id, key="instances", instance_ttl=15, replicas=8, **kwargs
+    )
+
+
+def test_instances_without_shards_share_guilds():
+    redis = FakeRedis("other")
+    cluster = make_cluster(redis, "me")
+    asyncio.run(cluster.heartbeat())
+    assert cluster.shared
+    assert cluster.ring.nodes == {"me", "other"}
+    assert cluster.stream_group("events") == "events"
+
+
+def test_instance_with_shards_reads_its_own_group():
+    redis = FakeRedis("other")
+    cluster = make_cluster(redis, "me", shard_ids=[2, 0], shard_count=4)
+    asyncio.run(cluster.heartbeat())
+    assert not cluster.shared
+    assert cluster.stream_group("events") == "events:shards-0-2"
+
+
+def test_stored_match_guild_decides_ownership():
+    redis = FakeRedis()
+    redis.values[b"match:1:guild"] = str(1 << 22).encode()
+    redis.values[b"match:2:guild"] = str(2 << 22).encode()
+    cluster = make_cluster(redis, "me", shard_ids=[1], shard_count=4)
+    assert asyncio.run(cluster.owns_match(1))
+    assert not asyncio.run(cluster.owns_match(2))
+    assert cluster.skipped == 1
+
+
+def test_guilds_are_owned_by_their_shard():
+    cluster = make_cluster(FakeRedis(), "me", shard_ids=[1], shard_count=4)
+    owned = [cluster.owns_guild(str(shard << 22)) for shard in range(8)]
+    assert owned == [shard_for(shard << 22, 4) == 1 for shard in range(8)]
+    assert owned.count(True) == 2
+
+
+def test_single_instance_owns_every_match():
+    cluster = make_cluster(FakeRedis(), "me")
+    asyncio.run(cluster.heartbeat())
+    assert asyncio.run(cluster.owns_match(1))
@@ -0,0 +1,95 @@
+"""Tests of the interaction guard."""
+
+import asyncio
+
+from bot.guard import InteractionGuard
+
+
+def test_successful_action_runs_once():
+    async def scenario():
+        guard = InteractionGuard(ttl=10, maxsize=10)
+        calls = []
+
+        async def callback():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return True
+
+        results = await asyncio.gather(
+            guard.run("match", "ban", callback), guard.run("match", "ban", callback)
+        )
+        return results, calls, guard.deduplicated
+
+    results, calls, deduplicated = asyncio.run(scenario())
+    assert sorted(results) == [(True, False), (True, True)]
+    assert calls == [1]
+    assert deduplicated == 1
+
+
+def test_failed_action_runs_again():
+    async def scenario():
+        guard = InteractionGuard(ttl=10, maxsize=10)
+        outcomes = iter([False, True])
+
+        async def callback():
+            return next(outcomes)
+
+        return [await guard.run("match", "ban", callback) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [(False, True), (True, True), (True, False)]
+
+
+def test_raising_action_is_forgotten():
+    async def scenario():
+        guard = InteractionGuard(ttl=10, maxsize=10)
+
+        async def failing():
+            raise RuntimeError
+
+        async def succeeding():
+            return True
+
+        try:
+            await guard.run("match", "ban", failing)
+        except RuntimeError:
+            pass
+        return await guard.run("match", "ban", succeeding)
+
+    assert asyncio.run(scenario()) == (True, True)
+
+
+def test_waiter_of_failed_action_runs_it():
+    async def scenario():
+        guard = InteractionGuard(ttl=10, maxsize=10)
+        outcomes = iter([False, True])
+
+        async def callback():
+            await asyncio.sleep(0.01)
+            return next(outcomes)
+
+        return await asyncio.gather(
+            guard.run("match", "ban", callback), guard.run("match", "ban", callback)
+        )
+
+    assert asyncio.run(scenario()) == [(False, True), (True, True)]
+
+
+def test_actions_of_a_resource_are_serialized():
+    async def scenario():
+        guard = InteractionGuard(ttl=10, maxsize=10)
+        running = []
+        overlaps = []
+
+        async def callback():
+            overlaps.append(bool(running))
+            running.append(1)
+            await asyncio.sleep(0.01)
+            running.pop()
+            return True
+
+        await asyncio.gather(
+            *(guard.run("match", action, callback) for action in range(3))
+        )
+        return overlaps
+
+    assert asyncio.run(scenario()) == [False, False, False]
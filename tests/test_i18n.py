@@ -0,0 +1,59 @@
+"""Tests of the translation catalog."""
+
+import pytest
+from pycord.i18n import I18n
+
+from bot.i18n import Catalog, catalog, compile_template
+
+TRANSLATIONS = {
+    "en-US": {"hello": "Hello {}", "bye": "Bye"},
+    "pt": {"hello": "Olá {}", "bye": "Tchau"},
+    "pt-BR": {"hello": "Oi {}", "bye": "Tchau"},
+}
+
+
+def test_template_fields():
+    assert compile_template("Match {} of {0} {name}").fields == ("", "0", "name")
+    assert compile_template("No fields").fields == ()
+
+
+def test_missing_key_is_rejected():
+    with pytest.raises(ValueError, match="pl is missing"):
+        Catalog({"en-US": {"a": "A", "b": "B"}, "pl": {"a": "A"}}, default="en-US")
+
+
+def test_unknown_key_is_rejected():
+    with pytest.raises(ValueError, match="pl has unknown"):
+        Catalog({"en-US": {"a": "A"}, "pl": {"a": "A", "b": "B"}}, default="en-US")
+
+
+def test_other_placeholders_are_rejected():
+    with pytest.raises(ValueError, match="placeholders"):
+        Catalog({"en-US": {"a": "A {}"}, "pl": {"a": "A"}}, default="en-US")
+
+
+def test_locale_falls_back_to_language_then_default():
+    translations = Catalog(TRANSLATIONS, default="en-US")
+    assert translations.table("pt-BR")["hello"].text == "Oi {}"
+    assert translations.table("pt-PT")["hello"].text == "Olá {}"
+    assert translations.table("de")["hello"].text == "Hello {}"
+    assert translations.table(None)["hello"].text == "Hello {}"
+
+
+def test_get_text_formats_in_the_current_locale(monkeypatch):
+    translations = Catalog(TRANSLATIONS, default="en-US")
+    monkeypatch.setattr(I18n.instance, "current_locale", "pt-BR", raising=False)
+    assert translations.get_text("hello", "Ana") == "Oi Ana"
+    assert translations.get_text("bye") == "Tchau"
+    assert translations.get_text("missing {}", 1) == "missing 1"
+
+
+def test_shipped_locales_are_valid():
+    catalog.validate()
+
+
+def test_equal_arguments_of_other_types_are_formatted_apart():
+    translations = Catalog({"en-US": {"count": "{}"}}, default="en-US")
+    assert translations.get_text("count", 1) == "1"
+    assert translations.get_text("count", True) == "True"
+    assert translations.get_text("count", 1.0) == "1.0"
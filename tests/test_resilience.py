@@ -0,0 +1,89 @@
+"""Tests of the API circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from bot import resilience
+from bot.resilience import (
+    ApiUnavailableError,
+    BreakerState,
+    CircuitBreaker,
+    is_retryable,
+)
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker("matches", failure_threshold=2, reset_timeout=5)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    with pytest.raises(ApiUnavailableError):
+        breaker.allow()
+
+
+def test_success_resets_failures(clock):
+    breaker = CircuitBreaker("matches", failure_threshold=2, reset_timeout=5)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker("matches", failure_threshold=1, reset_timeout=5)
+    breaker.record_failure()
+    clock[0] += 5
+    breaker.allow()
+    assert breaker.state == BreakerState.HALF_OPEN
+    with pytest.raises(ApiUnavailableError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+    breaker.allow()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("matches", failure_threshold=3, reset_timeout=5)
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 5
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.opened == 2
+    clock[0] += 4
+    with pytest.raises(ApiUnavailableError):
+        breaker.allow()
+
+
+def test_only_unavailability_is_retryable():
+    assert not is_retryable(ValueError())
+    assert is_retryable(resilience.httpx.ConnectError("refused"))
+    assert is_retryable(resilience.UnexpectedStatus(503, b""))
+    assert not is_retryable(resilience.UnexpectedStatus(404, b""))
+
+
+def test_cancelled_trial_lets_the_next_call_through(clock):
+    api = resilience.ResilientApi(
+        None,
+        retries=0,
+        backoff=0,
+        backoff_max=0,
+        deadline=5,
+        failure_threshold=1,
+        reset_timeout=5,
+    )
+    breaker = api.breaker("matches_retrieve")
+    breaker.record_failure()
+    clock[0] += 5
+
+    async def cancelled(client):
+        raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(api._attempt(cancelled, breaker, idempotent=True, kwargs={}))
+    assert breaker.state == BreakerState.HALF_OPEN
+    breaker.allow()
@@ -0,0 +1,132 @@
+"""Tests of the veto formats and state machine."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bot.veto import (
+    FORMATS,
+    UnknownFormatError,
+    VetoState,
+    VetoStep,
+    compile_format,
+    compile_formats,
+)
+
+
+def make_match(match_type: str, maps: list[str], bans=(), picks=()) -> SimpleNamespace:
+    def action(tag: str) -> SimpleNamespace:
+        return SimpleNamespace(map_=SimpleNamespace(tag=tag))
+
+    return SimpleNamespace(
+        id=1,
+        type=match_type,
+        maps=[SimpleNamespace(tag=tag) for tag in maps],
+        map_bans=[action(tag) for tag in bans],
+        map_picks=[action(tag) for tag in picks],
+    )
+
+
+def run_veto(state: VetoState) -> tuple[list[VetoStep], VetoState]:
+    steps = []
+    while state.step != VetoStep.LAUNCH:
+        steps.append(state.step)
+        map_tag = state.maps_left[0]
+        state = (
+            state.ban(map_tag) if state.step == VetoStep.BAN else state.pick(map_tag)
+        )
+    return steps, state
+
+
+def test_compile_format_skips_sides():
+    veto_format = compile_format("BO3", "ban ban pick side pick side ban ban")
+    assert veto_format.table == (
+        VetoStep.BAN,
+        VetoStep.BAN,
+        VetoStep.PICK,
+        VetoStep.PICK,
+        VetoStep.BAN,
+        VetoStep.BAN,
+    )
+    assert veto_format.num_maps == 3
+
+
+@pytest.mark.parametrize("sequence", ["ban launch", "ban kick"])
+def test_compile_format_rejects_invalid_steps(sequence):
+    with pytest.raises(ValueError):
+        compile_format("BO1", sequence)
+
+
+def test_compile_formats_ignores_unknown_match_types():
+    formats = compile_formats({"BO7": "ban pick", "BO1": "ban"})
+    assert "BO7" not in formats
+    assert formats["BO1"].table == (VetoStep.BAN,)
+
+
+@pytest.mark.parametrize("pool_size", [5, 7, 9])
+def test_bo1_bans_until_one_map_is_left(pool_size):
+    maps = [f"m{i}" for i in range(pool_size)]
+    steps, state = run_veto(VetoState.from_match(make_match("BO1", maps)))
+    assert steps == [VetoStep.BAN] * (pool_size - 1)
+    assert state.maplist == [maps[-1]]
+
+
+def test_bo3_follows_its_sequence_on_seven_maps():
+    maps = [f"m{i}" for i in range(7)]
+    steps, state = run_veto(VetoState.from_match(make_match("BO3", maps)))
+    assert steps == list(FORMATS["BO3"].table)
+    assert state.maplist == ["m2", "m3", "m6"]
+
+
+def test_bo3_bans_past_its_sequence_on_larger_pools():
+    maps = [f"m{i}" for i in range(9)]
+    steps, state = run_veto(VetoState.from_match(make_match("BO3", maps)))
+    assert steps == [*FORMATS["BO3"].table, VetoStep.BAN, VetoStep.BAN]
+    assert state.maplist == ["m2", "m3", "m8"]
+
+
+def test_bo5_plays_five_maps():
+    maps = [f"m{i}" for i in range(7)]
+    _, state = run_veto(VetoState.from_match(make_match("BO5", maps)))
+    assert len(state.maplist) == 5
+
+
+def test_from_match_resumes_a_started_veto():
+    maps = [f"m{i}" for i in range(7)]
+    state = VetoState.from_match(
+        make_match("BO3", maps, bans=["m0", "m1"], picks=["m2"])
+    )
+    assert state.actions == 3
+    assert state.maps_left == ("m3", "m4", "m5", "m6")
+    assert state.step == VetoStep.PICK
+    assert state.maplist == ["m2"]
+
+
+def test_api_maps_left_is_preferred():
+    state = VetoState.from_match(make_match("BO1", ["a", "b", "c"]))
+    assert state.ban("a", ["c", "b"]).maps_left == ("c", "b")
+
+
+@pytest.mark.parametrize("match_type", ["UNSET", "BO7"])
+def test_from_match_rejects_unknown_match_types(match_type):
+    with pytest.raises(UnknownFormatError):
+        VetoState.from_match(make_match(match_type, ["a", "b"]))
+
+
+def test_same_veto_ignores_the_order_of_maps_left():
+    match = make_match("BO3", ["a", "b", "c", "d", "e", "f", "g"])
+    api_order = VetoState.from_match(match).ban("a", ["g", "f", "e", "d", "c", "b"])
+    match_order = VetoState.from_match(make_match("BO3", match_maps(match), ["a"]))
+    assert api_order != match_order
+    assert api_order.same_veto(match_order)
+    assert not api_order.same_veto(match_order.ban("b"))
+
+
+def test_same_veto_compares_the_map_list():
+    picked = VetoState.from_match(make_match("BO1", ["a", "b"], bans=["a"]))
+    other = picked._replace(picks=("b",))
+    assert not picked.same_veto(other)
+
+
+def match_maps(match: SimpleNamespace) -> list[str]:
+    return [map_.tag for map_ in match.maps]